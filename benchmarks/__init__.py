@@ -0,0 +1,7 @@
+"""Benchmarks for measuring performance.
+
+Run these from the root of the repository, e.g.
+
+    python -m benchmarks.policy
+
+"""
@@ -0,0 +1,279 @@
+"""Benchmark of policy evaluation and workflow planning.
+
+This generates synthetic policies for a growing number of sites, and
+measures how long the main policy evaluation and planning operations
+take on them, so that their scaling behaviour is visible.
+
+Each generated site has a number of data assets at the bottom of a
+chain of asset collections (InAssetCollection rules), and a compute
+asset in a shared software collection. A site may access its own data
+and is given access to that of a few other sites at different levels
+of their hierarchy (MayAccess rules). Results computed from a site's
+data are in a per-site results collection, which is public
+(ResultOfIn rules).
+
+The job to plan runs a processing step on data from each of a few
+sites, and then combines the results, so that there are several valid
+plans.
+
+Run from the root of the repository as
+
+    python -m benchmarks.policy [--sites 10 20 50 100] [--depth 8] ...
+
+"""
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+from proof_of_concept.components.orchestration import WorkflowPlanner
+from proof_of_concept.definitions.identifier import Identifier
+from proof_of_concept.definitions.interfaces import IPolicyCollection
+from proof_of_concept.definitions.policy import Rule
+from proof_of_concept.definitions.workflows import Job, Workflow, WorkflowStep
+from proof_of_concept.policy.evaluation import (
+        PermissionCalculator, PolicyEvaluator)
+from proof_of_concept.policy.rules import (
+        InAssetCollection, MayAccess, ResultOfComputeIn, ResultOfDataIn)
+
+
+_public = 'asset_collection:ddm_ns:collection.Public'
+
+_software = 'asset_collection:ddm_ns:collection.Software'
+
+
+class SyntheticPolicy(IPolicyCollection):
+    """A generated policy for a number of sites.
+
+    Attributes:
+        sites: Ids of the sites.
+        rules: The rules making up the policy.
+    """
+    def __init__(
+            self, num_sites: int, depth: int, assets_per_site: int,
+            shares: int) -> None:
+        """Create a SyntheticPolicy.
+
+        Args:
+            num_sites: Number of sites to generate.
+            depth: Number of levels of asset collections above each
+                data asset.
+            assets_per_site: Number of data assets at each site.
+            shares: Number of other sites each site shares its data
+                with.
+        """
+        self.sites = [self.site(i) for i in range(num_sites)]
+        self.rules = list()     # type: List[Rule]
+
+        for i in range(num_sites):
+            self._add_site_rules(i, num_sites, depth, assets_per_site, shares)
+
+        self.rules.extend([
+            MayAccess('*', _software),
+            MayAccess('*', _public),
+            ResultOfDataIn(_public, '*', _public)])
+
+    def policies(self) -> List[Rule]:
+        """Returns the rules making up the policy."""
+        return self.rules
+
+    @staticmethod
+    def site(i: int) -> str:
+        """Returns the id of site i."""
+        return f'site:ns{i}:site'
+
+    @staticmethod
+    def data_asset(i: int, j: int) -> str:
+        """Returns the id of data asset j at site i."""
+        return f'asset:ns{i}:dataset.d{j}:ns{i}:site'
+
+    @staticmethod
+    def compute_asset(i: int) -> str:
+        """Returns the id of the compute asset at site i."""
+        return f'asset:ns{i}:software.process:ns{i}:site'
+
+    @staticmethod
+    def collection(i: int, level: int) -> str:
+        """Returns the id of a data collection of site i."""
+        return f'asset_collection:ns{i}:collection.level{level}'
+
+    def job(self, num_inputs: int) -> Job:
+        """Returns a job processing data from several sites.
+
+        Args:
+            num_inputs: Number of sites to take a data asset from.
+        """
+        num_sites = len(self.sites)
+        steps = [
+                WorkflowStep(
+                    f'process{k}', {'x': f'x{k}'}, ['y'],
+                    self.compute_asset((k + 1) % num_sites))
+                for k in range(num_inputs)]
+        steps.append(WorkflowStep(
+                'combine',
+                {f'x{k}': f'process{k}.y' for k in range(num_inputs)},
+                ['y'], self.compute_asset(0)))
+
+        workflow = Workflow(
+                [f'x{k}' for k in range(num_inputs)],
+                {'result': 'combine.y'}, steps)
+        inputs = {
+                f'x{k}': self.data_asset(k % num_sites, 0)
+                for k in range(num_inputs)}
+        return Job(workflow, inputs)
+
+    def _add_site_rules(
+            self, i: int, num_sites: int, depth: int, assets_per_site: int,
+            shares: int) -> None:
+        """Adds the rules for site i."""
+        for j in range(assets_per_site):
+            self.rules.append(InAssetCollection(
+                self.data_asset(i, j), self.collection(i, 0)))
+        for level in range(depth - 1):
+            self.rules.append(InAssetCollection(
+                self.collection(i, level), self.collection(i, level + 1)))
+
+        top = self.collection(i, depth - 1)
+        self.rules.append(MayAccess(self.site(i), top))
+        for k in range(1, shares + 1):
+            self.rules.append(MayAccess(
+                self.site((i + k) % num_sites),
+                self.collection(i, (k - 1) % depth)))
+
+        results = f'asset_collection:ns{i}:collection.Results'
+        for level in range(depth):
+            self.rules.append(ResultOfDataIn(
+                self.collection(i, level),
+                self.compute_asset((i + level + 1) % num_sites), results))
+        self.rules.append(ResultOfDataIn(top, '*', results))
+        self.rules.append(InAssetCollection(results, _public))
+
+        self.rules.append(InAssetCollection(self.compute_asset(i), _software))
+        self.rules.append(ResultOfComputeIn(
+            '*', self.compute_asset(i), _public))
+
+
+class _Sites:
+    """Stands in for a RegistryClient, for the WorkflowPlanner."""
+    def __init__(self, sites: List[str]) -> None:
+        """Create a _Sites object.
+
+        Args:
+            sites: Ids of sites with runners.
+        """
+        self._sites = sites
+
+    def list_sites_with_runners(self) -> List[str]:
+        """Returns ids of all sites."""
+        return self._sites
+
+
+def best_time(func: Callable[[], Any], min_time: float = 0.2) -> float:
+    """Measures the run time of a function.
+
+    The function is called repeatedly until min_time has passed, and at
+    least three times.
+
+    Args:
+        func: The function to measure.
+        min_time: Minimum total time to spend, in seconds.
+
+    Returns:
+        The shortest time a single call took, in seconds.
+    """
+    times = list()      # type: List[float]
+    total = 0.0
+    while total < min_time or len(times) < 3:
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+        total += times[-1]
+    return min(times)
+
+
+def run(
+        num_sites: int, depth: int, assets_per_site: int, shares: int,
+        num_inputs: int) -> Dict[str, float]:
+    """Measures policy evaluation for one policy size.
+
+    Args:
+        num_sites: Number of sites to generate.
+        depth: Number of levels of asset collections above each data
+            asset.
+        assets_per_site: Number of data assets at each site.
+        shares: Number of other sites each site shares its data with.
+        num_inputs: Number of data inputs of the job.
+
+    Returns:
+        Shortest times in seconds for each operation, and the number of
+        rules and plans as floats.
+    """
+    policy = SyntheticPolicy(num_sites, depth, assets_per_site, shares)
+    evaluator = PolicyEvaluator(policy)
+    calculator = PermissionCalculator(evaluator)
+    planner = WorkflowPlanner(
+            _Sites(policy.sites), evaluator)    # type: ignore
+    job = policy.job(num_inputs)
+
+    data_asset = Identifier(policy.data_asset(0, 0))
+    permissions = calculator.calculate_permissions(job)
+    result_perms = permissions['result']
+    plans = planner.make_plans(policy.site(0), job)
+    if not plans:
+        raise RuntimeError('Synthetic job cannot be planned, check policy')
+
+    return {
+            'rules': float(len(policy.rules)),
+            'plans': float(len(plans)),
+            'may_access': best_time(
+                lambda: evaluator.may_access(result_perms, policy.site(0))),
+            '_equivalent_assets': best_time(
+                lambda: evaluator._equivalent_assets(data_asset)),
+            'calculate_permissions': best_time(
+                lambda: calculator.calculate_permissions(job)),
+            'make_plans': best_time(
+                lambda: planner.make_plans(policy.site(0), job))}
+
+
+def main() -> None:
+    """Runs the benchmark and prints the results."""
+    parser = ArgumentParser(
+            description='Measure policy evaluation for growing policies')
+    parser.add_argument(
+            '--sites', type=int, nargs='+', default=[10, 20, 50, 100],
+            help='Numbers of sites to generate policies for')
+    parser.add_argument(
+            '--depth', type=int, default=8,
+            help='Levels of asset collections above each data asset')
+    parser.add_argument(
+            '--assets', type=int, default=10,
+            help='Number of data assets per site')
+    parser.add_argument(
+            '--shares', type=int, default=3,
+            help='Number of other sites each site shares data with')
+    parser.add_argument(
+            '--inputs', type=int, default=2,
+            help='Number of data inputs of the job')
+    args = parser.parse_args()
+
+    columns = [
+            'rules', 'plans', 'may_access', '_equivalent_assets',
+            'calculate_permissions', 'make_plans']
+    print('Times in ms, best of at least 3 runs')
+    print('{:>6} '.format('sites') + ' '.join(
+        '{:>{}}'.format(c, max(len(c), 8)) for c in columns))
+
+    for num_sites in args.sites:
+        results = run(
+                num_sites, args.depth, args.assets, args.shares, args.inputs)
+        cells = list()
+        for c in columns:
+            width = max(len(c), 8)
+            if c in ('rules', 'plans'):
+                cells.append('{:>{}d}'.format(int(results[c]), width))
+            else:
+                cells.append('{:>{}.3f}'.format(results[c] * 1000.0, width))
+        print('{:>6} '.format(num_sites) + ' '.join(cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark of site start-up time.
+
+This measures how long a freshly started Python process takes to import
+proof_of_concept.rest.ddm_site and to create the site's WSGI app using
+wsgi_app(), which is what a WSGI server does for every worker it
+spawns. A registry is started in the benchmark process for the site to
+connect to.
+
+Run from the root of the repository as
+
+    python -m benchmarks.startup [--repeat N]
+
+"""
+from argparse import ArgumentParser, SUPPRESS
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Dict, List
+
+
+_config = """name: site
+namespace: party.example.com
+owner: party:party.example.com:party
+registry_endpoint: http://localhost:4413
+"""
+
+
+def measure(config_file: Path) -> None:
+    """Starts a site and prints how long that took.
+
+    This is run in a fresh process, and prints a JSON object with the
+    time in seconds taken to import the site module and to create the
+    WSGI app.
+
+    Args:
+        config_file: Site configuration to use.
+    """
+    start = perf_counter()
+    from proof_of_concept.rest import ddm_site
+    imported = perf_counter()
+
+    ddm_site.default_config_location = config_file
+    ddm_site.wsgi_app()
+    created = perf_counter()
+
+    print(json.dumps({
+        'import': imported - start, 'wsgi_app': created - imported}))
+
+
+def run(repeat: int) -> Dict[str, List[float]]:
+    """Starts a site repeatedly, and returns the timings.
+
+    Args:
+        repeat: Number of times to start a site.
+
+    Returns:
+        Times in seconds for importing, creating the app, and running
+        the whole process including interpreter start-up and shutdown.
+    """
+    from proof_of_concept.registry.registry import Registry
+    from proof_of_concept.rest.registry import RegistryRestApi, RegistryServer
+
+    server = RegistryServer(RegistryRestApi(Registry()))
+    try:
+        with TemporaryDirectory() as tmp_dir:
+            config_file = Path(tmp_dir) / 'mahiru.conf'
+            config_file.write_text(_config)
+
+            times = {
+                    'import': list(), 'wsgi_app': list(), 'process': list()
+                    }   # type: Dict[str, List[float]]
+            for _ in range(repeat):
+                start = perf_counter()
+                result = subprocess.run(
+                        [sys.executable, '-m', 'benchmarks.startup',
+                            '--measure', str(config_file)],
+                        check=True, stdout=subprocess.PIPE,
+                        universal_newlines=True,
+                        cwd=Path(__file__).parents[1])
+                times['process'].append(perf_counter() - start)
+
+                measured = json.loads(result.stdout.splitlines()[-1])
+                times['import'].append(measured['import'])
+                times['wsgi_app'].append(measured['wsgi_app'])
+    finally:
+        server.close()
+
+    return times
+
+
+def main() -> None:
+    """Runs the benchmark and prints the results."""
+    parser = ArgumentParser(description='Measure site start-up time')
+    parser.add_argument(
+            '--repeat', type=int, default=10,
+            help='Number of times to start a site')
+    parser.add_argument('--measure', type=Path, help=SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure is not None:
+        measure(args.measure)
+        return
+
+    times = run(args.repeat)
+    print(f'Site start-up, {args.repeat} runs, in ms:')
+    for name, values in times.items():
+        print('{:>10}: min {:7.1f}  median {:7.1f}'.format(
+            name, min(values) * 1000.0, statistics.median(values) * 1000.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -31,10 +31,25 @@ class AssetStore(IAssetStore):
 
         """
         if asset.id in self._assets:
-            raise KeyError(f'There is already an asset with id {id}')
+            raise KeyError(f'There is already an asset with id {asset.id}')
 
         self._assets[asset.id] = asset
 
+    def exists(self, asset_id: Identifier) -> bool:
+        """Checks whether an asset is stored here.
+
+        This does not check permissions, and is intended for local use
+        only.
+
+        Args:
+            asset_id: ID of the asset to check for.
+
+        Return:
+            True iff an asset with the given id is stored here.
+
+        """
+        return asset_id in self._assets
+
     def retrieve(self, asset_id: Identifier, requester: str
                  ) -> Asset:
         """Retrieves an asset.
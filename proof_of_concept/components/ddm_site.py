@@ -3,8 +3,6 @@ import logging
 from pathlib import Path
 from typing import Any, Dict, List, Union
 
-import ruamel.yaml as yaml
-
 from proof_of_concept.components.asset_store import AssetStore
 from proof_of_concept.components.registry_client import RegistryClient
 from proof_of_concept.definitions.assets import Asset
@@ -16,7 +14,7 @@ from proof_of_concept.components.step_runner import StepRunner
 from proof_of_concept.policy.evaluation import PolicyEvaluator
 from proof_of_concept.policy.replication import PolicyStore
 from proof_of_concept.replication import ReplicableArchive
-from proof_of_concept.rest.validation import Validator
+from proof_of_concept.rest.validation import load_validator
 from proof_of_concept.components.orchestration import WorkflowOrchestrator
 from proof_of_concept.components.policy_client import PolicyClient
 
@@ -56,10 +54,7 @@ class Site:
 
         # Load API definitions
         site_api_file = Path(__file__).parents[1] / 'rest' / 'site_api.yaml'
-        with open(site_api_file, 'r') as f:
-            site_api_def = yaml.safe_load(f.read())
-
-        self._site_validator = Validator(site_api_def)
+        self._site_validator = load_validator(site_api_file)
 
         # Create clients for talking to the DDM
         self._registry_client = registry_client
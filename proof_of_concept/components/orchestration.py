@@ -168,7 +168,7 @@ class WorkflowExecutor:
                     outp_id_hash = id_hashes[wf_outp_name]
                     try:
                         asset_id = Identifier.from_id_hash(outp_id_hash)
-                        asset = self._site_rest_client.retrieve_asset(
+                        asset = self._site_rest_client.stream_asset(
                                 src_site, asset_id)
                         results[wf_outp_name] = asset.data
                     except KeyError:
@@ -1,18 +1,17 @@
 """Functionality for connecting to the central registry."""
 from pathlib import Path
-import requests
-from typing import Any, Callable, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set
 
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
-import ruamel.yaml as yaml
 
 from proof_of_concept.definitions.identifier import Identifier
 from proof_of_concept.definitions.registry import (
         PartyDescription, RegisteredObject, SiteDescription)
+from proof_of_concept.rest.connections import ConnectionPool, default_pool
 from proof_of_concept.rest.serialization import serialize
 from proof_of_concept.replication import Replica
 from proof_of_concept.rest.replication import RegistryRestClient
-from proof_of_concept.rest.validation import Validator
+from proof_of_concept.rest.validation import load_validator
 
 
 RegistryCallback = Callable[
@@ -26,22 +25,40 @@ class RegistryReplica(Replica[RegisteredObject]):
 
 class RegistryClient:
     """Local interface to the global registry."""
-    def __init__(self, endpoint: str = 'http://localhost:4413') -> None:
-        """Create a RegistryClient."""
+    def __init__(
+            self, endpoint: str = 'http://localhost:4413',
+            connection_pool: Optional[ConnectionPool] = None
+            ) -> None:
+        """Create a RegistryClient.
+
+        Args:
+            endpoint: URL of the registry's REST endpoint.
+            connection_pool: Pool of HTTP connections to use, if not
+                given, a process-wide pool is shared.
+
+        """
         self._registry_endpoint = endpoint
+        if connection_pool is None:
+            connection_pool = default_pool
+        self._connections = connection_pool
 
         self._callbacks = list()    # type: List[RegistryCallback]
 
+        # Indexes into the replica, kept up to date by
+        # _on_registry_update().
+        self._parties = dict()  # type: Dict[Identifier, PartyDescription]
+        self._sites = dict()    # type: Dict[Identifier, SiteDescription]
+        self._sites_by_ns = dict()      # type: Dict[str, SiteDescription]
+        self._runner_sites = dict()     # type: Dict[Identifier, None]
+
         # Set up connection to registry
         registry_api_file = (
                 Path(__file__).parents[1] / 'rest' / 'registry_api.yaml')
-        with open(registry_api_file, 'r') as f:
-            registry_api_def = yaml.safe_load(f.read())
-
-        registry_validator = Validator(registry_api_def)
+        registry_validator = load_validator(registry_api_file)
 
         registry_client = RegistryRestClient(
-                self._registry_endpoint + '/updates', registry_validator)
+                self._registry_endpoint + '/updates', registry_validator,
+                self._connections)
 
         self._registry_replica = RegistryReplica(
                 registry_client, on_update=self._on_registry_update)
@@ -81,9 +98,10 @@ class RegistryClient:
             description: Description of the party.
 
         """
-        requests.post(
+        self._connections.post(
                 self._registry_endpoint + '/parties',
                 json=serialize(description))
+        self._registry_replica.invalidate()
 
     def deregister_party(self, party: Identifier) -> None:
         """Deregister a party with the Registry.
@@ -92,9 +110,11 @@ class RegistryClient:
             party: The party to deregister.
 
         """
-        r = requests.delete(f'{self._registry_endpoint}/parties/{party}')
+        r = self._connections.delete(
+                f'{self._registry_endpoint}/parties/{party}')
         if r.status_code == 404:
             raise KeyError('Party not found')
+        self._registry_replica.invalidate()
 
     def register_site(self, description: SiteDescription) -> None:
         """Register a site with the Registry.
@@ -103,9 +123,10 @@ class RegistryClient:
             description: Description of the site.
 
         """
-        requests.post(
+        self._connections.post(
                 self._registry_endpoint + '/sites',
                 json=serialize(description))
+        self._registry_replica.invalidate()
 
     def deregister_site(self, site: Identifier) -> None:
         """Deregister a site with the Registry.
@@ -114,17 +135,19 @@ class RegistryClient:
             site: The site to deregister.
 
         """
-        r = requests.delete(f'{self._registry_endpoint}/sites/{site}')
+        r = self._connections.delete(
+                f'{self._registry_endpoint}/sites/{site}')
         if r.status_code == 404:
             raise KeyError('Site not found')
+        self._registry_replica.invalidate()
 
     def get_public_key_for_ns(self, namespace: str) -> RSAPublicKey:
         """Get the public key of the owner of a namespace."""
         # Do not update here, when this is called we're processing one
         # already.
-        site = self._get_site('namespace', namespace)
+        site = self._sites_by_ns.get(namespace)
         if site is not None:
-            owner = self._get_party(site.owner_id)
+            owner = self._parties.get(site.owner_id)
             if owner is None:
                 raise RuntimeError(f'Registry replica is broken')
             return owner.public_key
@@ -133,12 +156,7 @@ class RegistryClient:
     def list_sites_with_runners(self) -> List[str]:
         """Returns a list of id's of sites with runners."""
         self.update()
-        sites = list()    # type: List[str]
-        for o in self._registry_replica.objects:
-            if isinstance(o, SiteDescription):
-                if o.runner:
-                    sites.append(o.id)
-        return sites
+        return list(self._runner_sites)
 
     def get_site_by_id(self, site_id: Identifier) -> SiteDescription:
         """Gets a site's description by id.
@@ -153,32 +171,37 @@ class RegistryClient:
             KeyError: If no site with that id exists.
 
         """
-        site = self._get_site('id', site_id)
+        site = self._sites.get(site_id)
         if not site:
             raise KeyError(f'Site with id {site_id} not found')
         return site
 
-    def _get_party(self, party_id: Identifier) -> Optional[PartyDescription]:
-        """Returns the party with the given id."""
-        for o in self._registry_replica.objects:
-            if isinstance(o, PartyDescription):
-                if o.id == party_id:
-                    return o
-        return None
-
-    def _get_site(
-            self, attr_name: str, value: Any) -> Optional[SiteDescription]:
-        """Returns a site with a given attribute value."""
-        for o in self._registry_replica.objects:
-            if isinstance(o, SiteDescription):
-                a = getattr(o, attr_name)
-                if a is not None and a == value:
-                    return o
-        return None
-
     def _on_registry_update(
             self, created: Set[RegisteredObject],
             deleted: Set[RegisteredObject]) -> None:
-        """Calls callbacks when sites are updated."""
+        """Updates indexes and calls callbacks on changes."""
+        # Deletions first, an object may have been replaced by a new
+        # one with the same id.
+        for o in deleted:
+            if isinstance(o, PartyDescription):
+                self._parties.pop(o.id, None)
+            elif isinstance(o, SiteDescription):
+                self._sites.pop(o.id, None)
+                self._runner_sites.pop(o.id, None)
+                if o.namespace is not None:
+                    ns_site = self._sites_by_ns.get(o.namespace)
+                    if ns_site is not None and ns_site.id == o.id:
+                        del self._sites_by_ns[o.namespace]
+
+        for o in created:
+            if isinstance(o, PartyDescription):
+                self._parties[o.id] = o
+            elif isinstance(o, SiteDescription):
+                self._sites[o.id] = o
+                if o.runner:
+                    self._runner_sites[o.id] = None
+                if o.namespace is not None:
+                    self._sites_by_ns[o.namespace] = o
+
         for callback in self._callbacks:
             callback(created, deleted)
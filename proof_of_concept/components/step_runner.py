@@ -9,6 +9,7 @@ from proof_of_concept.definitions.assets import (
         ComputeAsset, DataAsset, Metadata)
 from proof_of_concept.definitions.interfaces import IStepRunner
 from proof_of_concept.definitions.workflows import JobSubmission, WorkflowStep
+from proof_of_concept.logs import Summary
 from proof_of_concept.policy.evaluation import (
         PermissionCalculator, PolicyEvaluator)
 from proof_of_concept.rest.client import SiteRestClient
@@ -58,6 +59,7 @@ class JobRun(Thread):
         self._plan = submission.plan
         self._sites = submission.plan.step_sites
         self._target_store = target_store
+        self._compute_assets = dict()   # type: Dict[Identifier, ComputeAsset]
 
     def run(self) -> None:
         """Runs the job.
@@ -80,16 +82,29 @@ class JobRun(Thread):
 
         while len(steps_to_do) > 0:
             for step in steps_to_do:
+                if self._have_outputs(step, id_hashes):
+                    logger.info(
+                            'Job at %s reusing results of step %s',
+                            self._this_site, step)
+                    steps_to_do.remove(step)
+                    break
+
                 inputs = self._get_step_inputs(step, id_hashes)
-                compute_asset = self._retrieve_compute_asset(
-                    step.compute_asset_id)
                 if inputs is not None:
-                    logger.info('Job at {} executing step {}'.format(
-                        self._this_site, step))
+                    logger.info(
+                            'Job at %s executing step %s',
+                            self._this_site, step)
                     # run compute asset step
+                    compute_asset = self._retrieve_compute_asset(
+                        step.compute_asset_id)
                     outputs = compute_asset.run(inputs)
 
                     # save output to store
+                    # Known limitation: the outputs share one subjob,
+                    # but it still grows with the part of the workflow
+                    # the step depends on, and so does the memory used
+                    # per stored result. Only its hash is sent along
+                    # with the results, see JobRecords.
                     step_subjob = self._job.subjob(step)
                     for output_name, output_value in outputs.items():
                         result_item = '{}.{}'.format(step.name, output_name)
@@ -98,13 +113,21 @@ class JobRun(Thread):
                         asset = DataAsset(
                                 Identifier.from_id_hash(result_id_hash),
                                 output_value, metadata)
-                        self._target_store.store(asset)
+                        try:
+                            self._target_store.store(asset)
+                        except KeyError:
+                            # Another job computed the same result
+                            # concurrently, which is fine as it's the
+                            # same value.
+                            logger.info(
+                                    'Job at %s found %s already stored',
+                                    self._this_site, asset.id)
 
                     steps_to_do.remove(step)
                     break
             else:
                 sleep(0.5)
-        logger.info('Job at {} done'.format(self._this_site))
+        logger.info('Job at %s done', self._this_site)
 
     def _is_legal(self) -> bool:
         """Checks whether this request is legal.
@@ -150,6 +173,30 @@ class JobRun(Thread):
 
         return True
 
+    def _have_outputs(
+            self, step: WorkflowStep, id_hashes: Dict[str, str]) -> bool:
+        """Checks whether the step's results are already available.
+
+        Results are named after the id hash of the computation that
+        produced them, so if results with the right names are in our
+        store, then this step has been run before, possibly as part of
+        a different job, and we can reuse them.
+
+        Args:
+            step: The step to check the outputs of.
+            id_hashes: Id hashes for the workflow's items.
+
+        Return:
+            True iff all of the step's outputs are in the target store.
+
+        """
+        for output_name in step.outputs:
+            result_item = '{}.{}'.format(step.name, output_name)
+            result_id = Identifier.from_id_hash(id_hashes[result_item])
+            if not self._target_store.exists(result_id):
+                return False
+        return True
+
     def _get_step_inputs(
             self, step: WorkflowStep, id_hashes: Dict[str, str]
             ) -> Optional[Dict[str, Any]]:
@@ -171,29 +218,47 @@ class JobRun(Thread):
         step_input_data = dict()
         for inp_name, inp_source in step.inputs.items():
             source_site, source_asset = self._source(inp_source, id_hashes)
-            logger.info('Job at {} getting input {} from site {}'.format(
-                self._this_site, source_asset, source_site))
+            logger.info(
+                    'Job at %s getting input %s from site %s',
+                    self._this_site, source_asset, source_site)
             try:
-                asset = self._site_rest_client.retrieve_asset(
+                asset = self._site_rest_client.stream_asset(
                         source_site, source_asset)
                 step_input_data[inp_name] = asset.data
-                logger.info('Job at {} found input {} available.'.format(
-                    self._this_site, source_asset))
-                logger.info('Metadata: {}'.format(asset.metadata))
+                logger.info(
+                        'Job at %s found input %s available.',
+                        self._this_site, source_asset)
+                logger.debug('Metadata: %s', Summary(asset.metadata))
             except KeyError:
-                logger.info(f'Job at {self._this_site} found input'
-                            f' {source_asset} not yet available.')
+                logger.info(
+                        'Job at %s found input %s not yet available.',
+                        self._this_site, source_asset)
                 return None
 
         return step_input_data
 
     def _retrieve_compute_asset(
             self, compute_asset_id: Identifier) -> ComputeAsset:
-        asset = self._site_rest_client.retrieve_asset(
-                compute_asset_id.location(), compute_asset_id)
-        if not isinstance(asset, ComputeAsset):
-            raise TypeError('Expecting a compute asset in workflow')
-        return asset
+        """Obtains a compute asset, downloading it at most once.
+
+        Compute assets are immutable, so once we have one we keep it
+        for the rest of the job, rather than downloading it again for
+        every step that uses it.
+
+        Args:
+            compute_asset_id: Id of the compute asset to obtain.
+
+        Return:
+            The requested compute asset.
+
+        """
+        if compute_asset_id not in self._compute_assets:
+            asset = self._site_rest_client.retrieve_asset(
+                    compute_asset_id.location(), compute_asset_id)
+            if not isinstance(asset, ComputeAsset):
+                raise TypeError('Expecting a compute asset in workflow')
+            self._compute_assets[compute_asset_id] = asset
+        return self._compute_assets[compute_asset_id]
 
     def _source(
             self, inp_source: str, id_hashes: Dict[str, str]
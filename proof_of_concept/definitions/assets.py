@@ -27,6 +27,10 @@ class Metadata:
         self.job = job
         self.item = item
 
+    def __repr__(self) -> str:
+        """Returns a string representation of the object."""
+        return 'Metadata({}, {})'.format(self.job, self.item)
+
 
 class Asset:
     """Asset, a representation of a computation or piece of data."""
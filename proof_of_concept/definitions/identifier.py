@@ -1,6 +1,6 @@
 """Identifier for various things in the DDM."""
 import re
-from typing import Any, cast, List, Type
+from typing import Any, Dict, Optional, Tuple, Type
 
 
 class Identifier(str):
@@ -19,10 +19,20 @@ class Identifier(str):
     is used as a wildcard in rules.
 
     See the Terminology section of the documentation for details.
+
+    Identifiers are split into segments once, when they are created.
     """
+    _segments = ()      # type: Tuple[str, ...]
+
+    _location = None    # type: Optional[Identifier]
+
     def __new__(cls: Type['Identifier'], seq: Any) -> 'Identifier':
         """Create an Identifier.
 
+        Identifiers are immutable, so valid ones are interned: creating
+        an Identifier from a string that was seen recently returns the
+        same object again, without validating it a second time.
+
         Args:
             seq: Contents, will be converted to a string using str(),
             then used as the identifier.
@@ -30,7 +40,13 @@ class Identifier(str):
         Raises:
             ValueError: If str(seq) is not a valid identifier.
         """
+        if type(seq) is cls:
+            return seq
+
         data = str(seq)
+        cached = cls._cache.get(data)
+        if cached is not None:
+            return cached
 
         if data != '*':
             segments = data.split(':')
@@ -44,7 +60,44 @@ class Identifier(str):
                 if not cls._segment_regex.match(segment):
                     raise ValueError(f'Invalid identifier segment {segment}')
 
-        return str.__new__(cls, seq)        # type: ignore
+        return cls._intern(data)
+
+    @classmethod
+    def trusted(cls, data: str) -> 'Identifier':
+        """Creates an Identifier without validating it.
+
+        This is for identifiers we generate ourselves from parts of
+        valid identifiers or from hashes, which are valid by
+        construction. Never pass external input to this function.
+
+        Args:
+            data: A valid identifier string.
+
+        Returns:
+            The Identifier.
+        """
+        cached = cls._cache.get(data)
+        if cached is not None:
+            return cached
+        return cls._intern(data)
+
+    @classmethod
+    def _intern(cls, data: str) -> 'Identifier':
+        """Creates an Identifier and adds it to the cache.
+
+        Args:
+            data: A valid identifier string.
+
+        Returns:
+            The new Identifier.
+        """
+        if len(cls._cache) >= cls._cache_size:
+            cls._cache.clear()
+        identifier = str.__new__(cls, data)     # type: Identifier
+        identifier._segments = tuple(data.split(':'))
+        identifier._location = None
+        cls._cache[data] = identifier
+        return identifier
 
     @classmethod
     def from_id_hash(cls, id_hash: str) -> 'Identifier':
@@ -56,12 +109,21 @@ class Identifier(str):
         Returns:
             The Identifier for the workflow result.
         """
-        return cls(f'result:{id_hash}')
+        return cls.trusted(f'result:{id_hash}')
 
     @property
-    def segments(self) -> List[str]:
-        """Return the list of segments of this identifier."""
-        return self.split(':')
+    def segments(self) -> Tuple[str, ...]:
+        """Return the segments of this identifier."""
+        return self._segments
+
+    @property
+    def kind(self) -> str:
+        """Return the kind of thing this identifier refers to.
+
+        This is the first segment, e.g. 'asset' or 'site', or '*' for
+        the wildcard.
+        """
+        return self._segments[0]
 
     def namespace(self) -> str:
         """Returns the namespace this asset is in.
@@ -72,9 +134,22 @@ class Identifier(str):
         Raises:
             RuntimeError: If this is not a primary asset.
         """
-        if self.segments[0] == 'result':
+        if self._segments[0] == 'result':
             raise RuntimeError('Results do not have a namespace')
-        return self.segments[1]
+        return self._segments[1]
+
+    def name(self) -> str:
+        """Returns the name of the identified object.
+
+        Returns:
+            The name, without the kind and namespace.
+
+        Raises:
+            RuntimeError: If this is a result.
+        """
+        if self._segments[0] == 'result':
+            raise RuntimeError('Results do not have a name')
+        return self._segments[2]
 
     def location(self) -> 'Identifier':
         """Returns the identifier of the site storing this asset.
@@ -85,10 +160,13 @@ class Identifier(str):
         Raises:
             RuntimeError: If this is not a concrete asset.
         """
-        if self.segments[0] != 'asset':
-            raise RuntimeError(
-                    'Location requested of non-concrete asset {self}')
-        return Identifier(f'site:{self.segments[3]}:{self.segments[4]}')
+        if self._location is None:
+            if self._segments[0] != 'asset':
+                raise RuntimeError(
+                        f'Location requested of non-concrete asset {self}')
+            self._location = Identifier.trusted(
+                    f'site:{self._segments[3]}:{self._segments[4]}')
+        return self._location
 
     _kinds = (
         'party', 'party_collection', 'site', 'asset', 'asset_collection',
@@ -99,3 +177,8 @@ class Identifier(str):
             'asset_collection': 3, 'result': 2}
 
     _segment_regex = re.compile('[a-zA-Z0-9_.-]*')
+
+    # Interned identifiers, cleared when full
+    _cache = dict()     # type: Dict[str, Identifier]
+
+    _cache_size = 65536
@@ -68,6 +68,21 @@ class IAssetStore:
         """
         raise NotImplementedError()
 
+    def exists(self, asset_id: Identifier) -> bool:
+        """Checks whether an asset is stored here.
+
+        This does not check permissions, and is intended for local use
+        only.
+
+        Args:
+            asset_id: ID of the asset to check for.
+
+        Return:
+            True iff an asset with the given id is stored here.
+
+        """
+        raise NotImplementedError()
+
     def retrieve(self, asset_id: Identifier, requester: str
                  ) -> Asset:
         """Retrieves an asset.
@@ -1,9 +1,38 @@
 """Classes for describing and managing policies."""
+from typing import Any, Optional
+
 from proof_of_concept.definitions.signable import Signable
 
 
 class Rule(Signable):
-    """Abstract base class for policy rules."""
+    """Abstract base class for policy rules.
+
+    Rules are compared and hashed by type and signing representation,
+    so that rules received from elsewhere match the local copies of
+    the same rule. The representation is made the first time it is
+    needed and then kept, so rules must not be modified after they
+    have been compared or hashed.
+    """
+    __slots__ = ('_key',)
+
+    def __eq__(self, other: Any) -> bool:
+        """Returns True iff other is the same rule."""
+        if type(self) is not type(other):
+            return NotImplemented
+        return self._signing_key() == other._signing_key()
+
+    def __hash__(self) -> int:
+        """Returns a hash of the rule's value."""
+        return hash((type(self), self._signing_key()))
+
+    def _signing_key(self) -> bytes:
+        """Returns the signing representation, making it only once."""
+        key = getattr(self, '_key', None)     # type: Optional[bytes]
+        if key is None:
+            key = self.signing_representation()
+            self._key = key
+        return key
+
     def signing_namespace(self) -> str:
         """Return the namespace whose owner must sign this rule."""
         raise NotImplemented
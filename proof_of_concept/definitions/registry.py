@@ -1,5 +1,5 @@
 """Definitions of the contents of the central registry."""
-from typing import Optional
+from typing import Any, Optional, Tuple
 
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
 
@@ -8,7 +8,7 @@ from proof_of_concept.definitions.identifier import Identifier
 
 class RegisteredObject:
     """Base class for objects in the registry."""
-    pass
+    __slots__ = ()
 
 
 class PartyDescription(RegisteredObject):
@@ -19,6 +19,8 @@ class PartyDescription(RegisteredObject):
         public_key: The party's public key for signing rules.
 
     """
+    __slots__ = ('id', 'public_key')
+
     def __init__(self, party_id: Identifier, public_key: RSAPublicKey) -> None:
         """Create a PartyDescription.
 
@@ -33,6 +35,17 @@ class PartyDescription(RegisteredObject):
         """Returns a string representation of the object."""
         return f'PartyDescription({self.id})'
 
+    def __eq__(self, other: Any) -> bool:
+        """Returns True iff other describes the same party."""
+        if not isinstance(other, PartyDescription):
+            return NotImplemented
+        return self.id == other.id and self.public_key == other.public_key
+
+    def __hash__(self) -> int:
+        """Returns a hash of the description."""
+        # Public keys are not hashable
+        return hash(self.id)
+
 
 class SiteDescription(RegisteredObject):
     """Describes a site to the rest of the DDM.
@@ -48,6 +61,10 @@ class SiteDescription(RegisteredObject):
             if any.
 
     """
+    __slots__ = (
+            'id', 'owner_id', 'admin_id', 'endpoint', 'runner', 'store',
+            'namespace')
+
     def __init__(
             self,
             site_id: Identifier,
@@ -86,3 +103,17 @@ class SiteDescription(RegisteredObject):
     def __repr__(self) -> str:
         """Returns a string representation of the object."""
         return f'SiteDescription({self.id})'
+
+    def __eq__(self, other: Any) -> bool:
+        """Returns True iff other describes the same site."""
+        if not isinstance(other, SiteDescription):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        """Returns a hash of the description."""
+        return hash(self._values())
+
+    def _values(self) -> Tuple[Any, ...]:
+        """Returns the values of the attributes of this object."""
+        return tuple(getattr(self, name) for name in self.__slots__)
@@ -7,8 +7,16 @@ from cryptography.hazmat.primitives.asymmetric.rsa import (
 
 
 class Signable:
-    """An abstract base class for signable classes."""
-    signature = None      # type: bytes
+    """An abstract base class for signable classes.
+
+    Attributes:
+        signature: The signature, or None if the object is unsigned.
+    """
+    __slots__ = ('signature',)
+
+    def __init__(self) -> None:
+        """Create an unsigned object."""
+        self.signature = None     # type: bytes
 
     def sign(self, key: RSAPrivateKey) -> None:
         """Sign the object.
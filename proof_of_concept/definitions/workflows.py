@@ -1,6 +1,7 @@
 """Classes for describing workflows."""
 from hashlib import sha256
-from typing import Dict, List, Mapping, Set, Tuple, Union
+import json
+from typing import Dict, List, Mapping, Optional, Set, Tuple, Union
 
 from proof_of_concept.definitions.identifier import Identifier
 
@@ -181,12 +182,35 @@ class Job:
         self.inputs = {
                 inp: aid if isinstance(aid, Identifier) else Identifier(aid)
                 for inp, aid in inputs.items()}
+        self._content_hash = None   # type: Optional[str]
 
     def __repr__(self) -> str:
         """Returns a string representation of the object."""
         return 'Job({}, {})'.format(
                 self.inputs, self.workflow)
 
+    def content_hash(self) -> str:
+        """Returns a hash of the job's contents.
+
+        Jobs with the same workflow and inputs have the same hash, so
+        that it can be used to refer to a job. Jobs are not supposed to
+        be modified, so the hash is calculated only once.
+
+        Returns:
+            The hash as a hexadecimal string.
+        """
+        if self._content_hash is None:
+            steps = [
+                    [step.name, step.inputs, step.outputs,
+                        step.compute_asset_id]
+                    for _, step in sorted(self.workflow.steps.items())]
+            content = [
+                    self.workflow.inputs, self.workflow.outputs, steps,
+                    self.inputs]
+            self._content_hash = sha256(json.dumps(
+                content, sort_keys=True).encode('utf-8')).hexdigest()
+        return self._content_hash
+
     @staticmethod
     def niljob(asset_id: Identifier) -> 'Job':
         """Returns a zero-step job for a dataset.
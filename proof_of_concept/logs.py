@@ -0,0 +1,152 @@
+"""Support for cheap logging of large objects.
+
+Request bodies, replica updates and asset metadata can be very large,
+and formatting them into a log message takes time even if the message
+is then discarded because its level is disabled. Wrap such objects in
+a Summary when passing them to a logger, and use %-style formatting:
+
+    logger.info('Replication update: %s', Summary(update_json))
+
+This formats the object only if the message is actually emitted, and
+then only its first few hundred characters.
+
+set_log_levels() sets levels per subsystem, so that e.g. the REST
+servers can be quiet while replication is being debugged.
+"""
+import logging
+from typing import Any, List, Mapping
+
+
+DEFAULT_SUMMARY_LENGTH = 200
+
+
+class _Full(Exception):
+    """Raised when a summary has reached its maximum length."""
+    pass
+
+
+class _SummaryWriter:
+    """Writes a representation of an object up to a maximum length.
+
+    This walks dicts, lists and tuples itself, so that it can stop as
+    soon as enough has been written, rather than converting an entire
+    large object to a string first and then cutting it short.
+    """
+    def __init__(self, max_length: int) -> None:
+        """Create a _SummaryWriter.
+
+        Args:
+            max_length: Maximum number of characters to write.
+        """
+        self.parts = list()     # type: List[str]
+        self._remaining = max_length
+
+    def write(self, obj: Any) -> None:
+        """Writes a representation of an object.
+
+        Args:
+            obj: The object to write.
+
+        Raises:
+            _Full: If the maximum length was reached.
+        """
+        if isinstance(obj, dict):
+            self._append('{')
+            for i, (key, value) in enumerate(obj.items()):
+                if i > 0:
+                    self._append(', ')
+                self.write(key)
+                self._append(': ')
+                self.write(value)
+            self._append('}')
+        elif isinstance(obj, (list, tuple)):
+            brackets = '[]' if isinstance(obj, list) else '()'
+            self._append(brackets[0])
+            for i, item in enumerate(obj):
+                if i > 0:
+                    self._append(', ')
+                self.write(item)
+            self._append(brackets[1])
+        elif isinstance(obj, (str, bytes)):
+            # avoid repr() of a long string, we'll only use the start
+            self._append(repr(obj[:self._remaining]))
+        else:
+            self._append(repr(obj))
+
+    def _append(self, text: str) -> None:
+        """Appends text, raising _Full if there is no more room."""
+        if len(text) >= self._remaining:
+            self.parts.append(text[:self._remaining])
+            self._remaining = 0
+            raise _Full()
+        self.parts.append(text)
+        self._remaining -= len(text)
+
+
+def summarize(obj: Any, max_length: int = DEFAULT_SUMMARY_LENGTH) -> str:
+    """Returns a representation of an object of limited length.
+
+    The result is the same as repr(obj) for plain data such as decoded
+    JSON, except that it is cut off after max_length characters, in
+    which case '...' and the number of items in obj are added.
+
+    Args:
+        obj: The object to summarize.
+        max_length: The maximum length of the representation, not
+            including the ellipsis.
+
+    Returns:
+        The summary.
+    """
+    writer = _SummaryWriter(max_length)
+    try:
+        writer.write(obj)
+    except _Full:
+        writer.parts.append('...')
+        if isinstance(obj, (dict, list, tuple)):
+            writer.parts.append(f' ({len(obj)} items)')
+    return ''.join(writer.parts)
+
+
+class Summary:
+    """Wraps an object for deferred, length-limited logging.
+
+    Converting an instance to a string returns summarize(obj). As
+    loggers only do that when a message is emitted, there is no cost
+    for disabled messages beyond creating this small object.
+    """
+    __slots__ = ('_obj', '_max_length')
+
+    def __init__(
+            self, obj: Any, max_length: int = DEFAULT_SUMMARY_LENGTH
+            ) -> None:
+        """Create a Summary.
+
+        Args:
+            obj: The object to summarize.
+            max_length: The maximum length of the representation.
+        """
+        self._obj = obj
+        self._max_length = max_length
+
+    def __str__(self) -> str:
+        """Returns the summary of the object."""
+        return summarize(self._obj, self._max_length)
+
+
+def set_log_levels(levels: Mapping[str, str]) -> None:
+    """Sets log levels for subsystems.
+
+    Each module has its own logger named after it, so that the level
+    for a subsystem can be set using the name of its package, e.g.
+    'proof_of_concept.rest' or 'proof_of_concept.components'. Levels
+    are given by name, e.g. 'DEBUG' or 'WARNING'.
+
+    Args:
+        levels: Levels to set, keyed by logger name.
+
+    Raises:
+        ValueError: If a level name is not known.
+    """
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level.upper())
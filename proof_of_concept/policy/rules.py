@@ -11,6 +11,8 @@ class InAssetCollection(Rule):
     This implies that anyone who can access the collection can access
     the Asset.
     """
+    __slots__ = ('asset', 'collection')
+
     def __init__(
             self, asset: Union[str, Identifier],
             collection: Union[str, Identifier]
@@ -21,6 +23,7 @@ class InAssetCollection(Rule):
             asset: The asset to put into the collection.
             collection: The collection to put it into.
         """
+        super().__init__()
         if not isinstance(asset, Identifier):
             asset = Identifier(asset)
         self.asset = asset
@@ -46,6 +49,8 @@ class InAssetCollection(Rule):
 
 class InPartyCollection(Rule):
     """Says that Party party is in PartyCollection collection."""
+    __slots__ = ('party', 'collection')
+
     def __init__(
             self, party: Union[str, Identifier],
             collection: Union[str, Identifier]
@@ -56,6 +61,7 @@ class InPartyCollection(Rule):
             party: A party.
             collection: The collection it is in.
         """
+        super().__init__()
         if not isinstance(party, Identifier):
             party = Identifier(party)
         self.party = party
@@ -81,6 +87,8 @@ class InPartyCollection(Rule):
 
 class MayAccess(Rule):
     """Says that Site site may access Asset asset."""
+    __slots__ = ('site', 'asset')
+
     def __init__(
             self, site: Union[str, Identifier], asset: Union[str, Identifier]
             ) -> None:
@@ -90,6 +98,7 @@ class MayAccess(Rule):
             site: The site that may access.
             asset: The asset that may be accessed.
         """
+        super().__init__()
         self.site = site if isinstance(site, Identifier) else Identifier(site)
         if not isinstance(asset, Identifier):
             asset = Identifier(asset)
@@ -118,6 +127,8 @@ class ResultOfIn(Rule):
     compute_asset is in collection, according to either the owner of
     data_asset or the owner of compute_asset.
     """
+    __slots__ = ('data_asset', 'compute_asset', 'collection')
+
     def __init__(
             self,
             data_asset: Union[str, Identifier],
@@ -131,6 +142,7 @@ class ResultOfIn(Rule):
             compute_asset: The compute asset used to process the data.
             collection: The output collection.
         """
+        super().__init__()
         if not isinstance(data_asset, Identifier):
             data_asset = Identifier(data_asset)
 
@@ -161,6 +173,8 @@ class ResultOfIn(Rule):
 
 class ResultOfDataIn(ResultOfIn):
     """ResultOfIn rule on behalf of the data asset owner."""
+    __slots__ = ()
+
     def signing_namespace(self) -> str:
         """Return the namespace whose owner must sign this rule."""
         return self.data_asset.namespace()
@@ -168,6 +182,8 @@ class ResultOfDataIn(ResultOfIn):
 
 class ResultOfComputeIn(ResultOfIn):
     """ResultOfIn rule on behalf of the compute asset owner."""
+    __slots__ = ()
+
     def signing_namespace(self) -> str:
         """Return the namespace whose owner must sign this rule."""
         return self.compute_asset.namespace()
@@ -1,6 +1,6 @@
 """Central registry of remote-accessible things."""
 import logging
-from typing import Any, Dict, Optional, Type, TypeVar
+from typing import Any, cast, Dict, List, Optional, Tuple, Type, TypeVar
 
 from proof_of_concept.definitions.identifier import Identifier
 from proof_of_concept.definitions.interfaces import IAssetStore
@@ -30,6 +30,13 @@ class Registry:
         archive = ReplicableArchive[RegisteredObject]()
         self.store = RegistryStore(archive, 0.1)
 
+        # Indexes of live objects in the store, by type and attribute
+        self._indexes = {
+                (typ, attr_name): dict()
+                for typ, attr_names in self._indexed_attributes.items()
+                for attr_name in attr_names
+                }   # type: Dict[Tuple[Type, str], Dict[Any, RegisteredObject]]
+
     def register_party(
             self, description: PartyDescription) -> None:
         """Register a party with the DDM.
@@ -41,7 +48,7 @@ class Registry:
             raise RuntimeError(
                     f'There is already a party called {description.id}')
 
-        self.store.insert(description)
+        self._insert(description)
         logger.info(f'Registered party {description}')
 
     def deregister_party(self, party_id: Identifier) -> None:
@@ -53,7 +60,7 @@ class Registry:
         description = self._get_object(PartyDescription, 'id', party_id)
         if description is None:
             raise KeyError('Party not found')
-        self.store.delete(description)
+        self._delete(description)
 
     def register_site(self, description: SiteDescription) -> None:
         """Register a Site with the Registry.
@@ -76,7 +83,7 @@ class Registry:
         if admin is None:
             raise RuntimeError(f'Party {description.admin_id} not found')
 
-        self.store.insert(description)
+        self._insert(description)
         logger.info(f'{self} Registered site {description}')
 
     def deregister_site(self, site_id: Identifier) -> None:
@@ -88,7 +95,30 @@ class Registry:
         description = self._get_object(SiteDescription, 'id', site_id)
         if description is None:
             raise KeyError('Site not found')
-        self.store.delete(description)
+        self._delete(description)
+
+    def _insert(self, obj: RegisteredObject) -> None:
+        """Inserts an object into the store and the indexes.
+
+        Args:
+            obj: The object to insert.
+        """
+        self.store.insert(obj)
+        for (typ, attr_name), index in self._indexes.items():
+            if isinstance(obj, typ):
+                index[getattr(obj, attr_name)] = obj
+
+    def _delete(self, obj: RegisteredObject) -> None:
+        """Deletes an object from the store and the indexes.
+
+        Args:
+            obj: The object to delete.
+        """
+        self.store.delete(obj)
+        for (typ, attr_name), index in self._indexes.items():
+            if isinstance(obj, typ):
+                if index.get(getattr(obj, attr_name)) is obj:
+                    del index[getattr(obj, attr_name)]
 
     def _get_object(
             self, typ: Type[_ReplicatedClass], attr_name: str, value: Any
@@ -99,6 +129,9 @@ class Registry:
         `value` for its attribute named `attr_name`. If there are
         multiple such objects, one is returned at random.
 
+        This is a dictionary lookup for the attributes listed in
+        _indexed_attributes, and a scan of the store otherwise.
+
         Args:
             typ: Type of object to consider, subclass of
                 RegisteredObject.
@@ -113,6 +146,10 @@ class Registry:
                 in the store which does not have an attribute named
                 `attr_name`.
         """
+        index = self._indexes.get((typ, attr_name))
+        if index is not None:
+            return cast(Optional[_ReplicatedClass], index.get(value))
+
         for o in self.store.objects():
             if isinstance(o, typ):
                 if getattr(o, attr_name) == value:
@@ -143,3 +180,8 @@ class Registry:
                 `attr_name`.
         """
         return self._get_object(typ, attr_name, value) is not None
+
+    _indexed_attributes = {
+            PartyDescription: ['id'],
+            SiteDescription: ['id']
+            }   # type: Dict[Type[RegisteredObject], List[str]]
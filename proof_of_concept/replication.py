@@ -14,8 +14,7 @@ the Python GIL.
 from datetime import datetime, timedelta
 import logging
 from typing import (
-        Callable, Generic, Iterable, Optional, Set, Type,
-        TypeVar)
+        Any, Callable, Dict, FrozenSet, Generic, Optional, Set, Type, TypeVar)
 
 from proof_of_concept.definitions.interfaces import (
         IReplicaUpdate, IReplicationService)
@@ -35,7 +34,12 @@ class Replicable(Generic[T]):
         deleted: The first version from which this object no
                 longer exists.
         object: The wrapped object.
+
+    Records are identified by the object and when it was created, so
+    that setting deleted does not change their hash.
     """
+    __slots__ = ('created', 'deleted', 'object')
+
     def __init__(self, created: int, obj: T) -> None:
         """Create a Replicable wrapping an object.
 
@@ -52,6 +56,16 @@ class Replicable(Generic[T]):
         return 'Replicable({}, {}, {})'.format(
                 self.created, self.deleted, self.object)
 
+    def __eq__(self, other: Any) -> bool:
+        """Returns True iff other is a record of the same object."""
+        if not isinstance(other, Replicable):
+            return NotImplemented
+        return self.created == other.created and self.object == other.object
+
+    def __hash__(self) -> int:
+        """Returns a hash of the record."""
+        return hash((self.created, self.object))
+
 
 class ReplicableArchive(Generic[T]):
     """Stores an archive of replicable objects.
@@ -122,20 +136,34 @@ class CanonicalStore(IReplicationService[T]):
         self._archive = archive
         self._max_lag = max_lag
 
-    def objects(self) -> Iterable[T]:
-        """Iterate through currently extant objects."""
-        return {
-                rec.object for rec in self._archive.records
-                if rec.deleted is None}
+        # Records of currently extant objects, kept in sync with the
+        # archive so that we don't have to scan it.
+        self._live = {
+                rec.object: rec for rec in archive.records
+                if rec.deleted is None}     # type: Dict[T, Replicable[T]]
+
+    def objects(self) -> FrozenSet[T]:
+        """Returns the currently extant objects.
+
+        This is a snapshot, so it can be iterated over safely while
+        other threads insert and delete objects.
+        """
+        return frozenset(self._live)
 
     def insert(self, obj: T) -> None:
         """Insert an object into the collection of objects.
 
+        Inserting an object that is already present has no effect.
+
         Args:
             obj: A new object to add.
         """
+        if obj in self._live:
+            return
         new_version = self._archive.version + 1
-        self._archive.records.add(Replicable(new_version, obj))
+        record = Replicable(new_version, obj)
+        self._archive.records.add(record)
+        self._live[obj] = record
         self._archive.version = new_version
 
     def delete(self, obj: T) -> None:
@@ -147,13 +175,10 @@ class CanonicalStore(IReplicationService[T]):
         Raises:
             ValueError: If the object is not present.
         """
-        new_version = self._archive.version + 1
-        for rec in self._archive.records:
-            if rec.object == obj:
-                rec.deleted = new_version
-                break
-        else:
+        if obj not in self._live:
             raise ValueError('Object not found')
+        new_version = self._archive.version + 1
+        self._live.pop(obj).deleted = new_version
         self._archive.version = new_version
 
     def get_updates_since(self, from_version: int) -> ReplicaUpdate[T]:
@@ -242,6 +267,14 @@ class Replica(Generic[T]):
         """
         return datetime.now() < self._valid_until
 
+    def invalidate(self) -> None:
+        """Marks the replica as outdated.
+
+        The next call to update() will then fetch an update from the
+        source, e.g. because we know that we just changed it.
+        """
+        self._valid_until = datetime.fromtimestamp(0.0)
+
     def update(self) -> None:
         """Updates the replica, if necessary."""
         if not self.is_valid():
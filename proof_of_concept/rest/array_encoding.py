@@ -0,0 +1,130 @@
+"""Binary encoding of numeric asset data.
+
+Asset data consisting of a single number or a flat list of numbers can
+be sent as a raw array of 64-bit little-endian integers or floats,
+rather than as JSON text. The media type describes the layout, e.g.
+
+    application/vnd.ddm.array; dtype=float64; shape=list
+
+where dtype is int64 or float64, and shape is scalar for a single
+number or list for a list of numbers. Lists mixing integers and floats,
+and anything else, are sent as JSON.
+"""
+from array import array
+import sys
+from typing import Any, Generator, Optional, Tuple
+
+
+ARRAY_MEDIA_TYPE = 'application/vnd.ddm.array'
+
+
+_typecodes = {'int64': 'q', 'float64': 'd'}
+
+
+def _is_number(value: Any) -> bool:
+    """Returns True iff value is an int or a float, but not a bool."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def array_layout(data: Any) -> Optional[Tuple[str, str]]:
+    """Determines whether and how data can be encoded as an array.
+
+    Args:
+        data: The data to encode.
+
+    Returns:
+        A tuple (dtype, shape) describing the encoding, or None if the
+        data cannot be encoded as an array.
+    """
+    if _is_number(data):
+        values = [data]
+        shape = 'scalar'
+    elif isinstance(data, list) and all(map(_is_number, data)):
+        values = data
+        shape = 'list'
+    else:
+        return None
+
+    if all(isinstance(value, int) for value in values):
+        if all(-2**63 <= value < 2**63 for value in values):
+            return 'int64', shape
+        return None
+    if all(isinstance(value, float) for value in values):
+        return 'float64', shape
+    # Mixed lists go as JSON, so that the ints stay ints
+    return None
+
+
+def array_media_type(dtype: str, shape: str) -> str:
+    """Returns the media type for an array encoding.
+
+    Args:
+        dtype: Type of the elements, int64 or float64.
+        shape: Either scalar or list.
+    """
+    return f'{ARRAY_MEDIA_TYPE}; dtype={dtype}; shape={shape}'
+
+
+def encode_array(
+        data: Any, dtype: str, chunk_size: int = 65536
+        ) -> Generator[bytes, None, None]:
+    """Encodes data as an array, a chunk at a time.
+
+    Args:
+        data: The data to encode, which must have the given layout,
+            see array_layout().
+        dtype: Type of the elements, int64 or float64.
+        chunk_size: Approximate size of the chunks to produce, in
+            bytes.
+
+    Returns:
+        A generator producing the encoded data in chunks.
+    """
+    values = data if isinstance(data, list) else [data]
+    typecode = _typecodes[dtype]
+    items_per_chunk = max(chunk_size // 8, 1)
+    for i in range(0, len(values), items_per_chunk):
+        chunk = array(typecode, values[i:i + items_per_chunk])
+        if sys.byteorder != 'little':
+            chunk.byteswap()
+        yield chunk.tobytes()
+
+
+def decode_array(media_type: str, encoded: bytes) -> Any:
+    """Decodes data encoded by encode_array().
+
+    Args:
+        media_type: The media type of the encoded data, including
+            dtype and shape parameters.
+        encoded: The encoded data.
+
+    Returns:
+        The decoded number or list of numbers.
+
+    Raises:
+        ValueError: If the media type or data is invalid.
+    """
+    base, *param_strs = [part.strip() for part in media_type.split(';')]
+    if base != ARRAY_MEDIA_TYPE:
+        raise ValueError(f'Not an array media type: {media_type}')
+
+    params = dict()
+    for param_str in param_strs:
+        name, _, value = param_str.partition('=')
+        params[name.strip()] = value.strip()
+
+    typecode = _typecodes.get(params.get('dtype', ''))
+    if typecode is None:
+        raise ValueError(f'Invalid array type in {media_type}')
+
+    values = array(typecode)
+    values.frombytes(encoded)
+    if sys.byteorder != 'little':
+        values.byteswap()
+
+    shape = params.get('shape')
+    if shape == 'list':
+        return values.tolist()
+    elif shape == 'scalar' and len(values) == 1:
+        return values[0]
+    raise ValueError(f'Invalid array shape in {media_type}')
@@ -0,0 +1,123 @@
+"""Serving the REST APIs from an asyncio event loop.
+
+The wsgiref servers used by SiteServer and RegistryServer start a
+thread per connection, and close each connection after a single
+response. The server here instead runs the API on an event loop using
+uvicorn, with HTTP/1.1 keep-alive, a bound on the number of concurrent
+connections and requests, and graceful shutdown.
+
+The handlers themselves are synchronous, so the application is adapted
+to ASGI by running them on a fixed-size pool of worker threads.
+
+This requires the optional uvicorn and a2wsgi packages.
+"""
+import logging
+import socket
+from threading import Thread
+from time import sleep
+from typing import Any, Callable
+
+from a2wsgi import WSGIMiddleware
+from falcon import App
+from uvicorn import Config, Server
+
+from proof_of_concept.rest import ddm_site, registry
+
+
+logger = logging.getLogger(__name__)
+
+
+ASGIApp = Callable[..., Any]
+
+
+def to_asgi(app: App, workers: int = 10) -> ASGIApp:
+    """Adapts a REST API to ASGI.
+
+    Args:
+        app: The falcon application of the API, e.g. SiteRestApi.app.
+        workers: Number of threads to run request handlers on.
+
+    Returns:
+        An ASGI application serving the API.
+    """
+    asgi_app = WSGIMiddleware(app, workers=workers)     # type: ASGIApp
+    return asgi_app
+
+
+class AsgiServer:
+    """An HTTP server serving a REST API from an event loop.
+
+    This can be used in place of a SiteServer or a RegistryServer.
+    Make sure to call `close()` when you're done, or the program will
+    not shut down because the background thread will still be running.
+
+    Attributes:
+        endpoint: The HTTP endpoint at which the server can be reached.
+
+    """
+    def __init__(
+            self, app: App, port: int = 0, workers: int = 10,
+            max_connections: int = 1000, keep_alive: int = 5,
+            shutdown_timeout: int = 10
+            ) -> None:
+        """Create an AsgiServer serving an API.
+
+        This starts a background thread with an event loop running the
+        server, and returns once it is accepting connections.
+
+        Args:
+            app: The falcon application of the API to serve.
+            port: Port to listen on, 0 to pick a free one.
+            workers: Number of threads to run request handlers on.
+            max_connections: Maximum number of concurrent connections
+                and requests, beyond which requests are refused with a
+                503 status.
+            keep_alive: Time in seconds to keep idle connections open.
+            shutdown_timeout: Time in seconds to wait for running
+                requests to finish when closing the server.
+
+        """
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(('0.0.0.0', port))
+
+        config = Config(
+                to_asgi(app, workers), lifespan='off', log_config=None,
+                access_log=False, limit_concurrency=max_connections,
+                timeout_keep_alive=keep_alive,
+                timeout_graceful_shutdown=shutdown_timeout)
+        self._server = Server(config)
+
+        self._thread = Thread(
+                target=self._server.run, kwargs={'sockets': [self._socket]},
+                name='AsgiServer')
+        self._thread.start()
+
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError('Server failed to start')
+            sleep(0.01)
+
+        host, port = self._socket.getsockname()
+        self.endpoint = f'http://{socket.getfqdn(host)}:{port}'
+        logger.info(f'ASGI server listening on {self.endpoint}')
+
+    def close(self) -> None:
+        """Stop the server.
+
+        This stops accepting new connections, waits for requests in
+        progress to finish, and then stops the server thread.
+        """
+        self._server.should_exit = True
+        self._thread.join()
+        self._socket.close()
+
+
+def site_asgi_app() -> ASGIApp:
+    """Creates an ASGI app for a site, for an ASGI runner."""
+    return to_asgi(ddm_site.wsgi_app())
+
+
+def registry_asgi_app() -> ASGIApp:
+    """Creates an ASGI app for the registry, for an ASGI runner."""
+    return to_asgi(registry.wsgi_app())
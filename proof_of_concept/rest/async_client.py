@@ -0,0 +1,440 @@
+"""Asynchronous clients for REST APIs.
+
+These mirror SiteRestClient, ReplicationRestClient and the registration
+functions of RegistryClient, but are coroutine-based, so that many
+cross-site operations can be run concurrently from a single event loop
+rather than each needing a thread.
+
+This requires the optional httpx package.
+"""
+import asyncio
+import logging
+from tempfile import SpooledTemporaryFile
+from types import TracebackType
+from typing import Any, Dict, Generic, Optional, Type, TypeVar
+
+import httpx
+# not exported, but the only way to find out whether httpx decodes zstd
+from httpx._decoders import SUPPORTED_DECODERS
+
+from proof_of_concept.components.registry_client import RegistryClient
+from proof_of_concept.definitions.assets import (
+        Asset, ComputeAsset, DataAsset, Metadata)
+from proof_of_concept.definitions.identifier import Identifier
+from proof_of_concept.definitions.policy import Rule
+from proof_of_concept.definitions.registry import (
+        PartyDescription, RegisteredObject, SiteDescription)
+from proof_of_concept.definitions.workflows import Job, JobSubmission
+from proof_of_concept.logs import Summary
+from proof_of_concept.policy.definitions import PolicyUpdate
+from proof_of_concept.registry.replication import RegistryUpdate
+from proof_of_concept.replication import ReplicaUpdate
+from proof_of_concept.rest import json_codec
+from proof_of_concept.rest.array_encoding import (
+        ARRAY_MEDIA_TYPE, decode_array)
+from proof_of_concept.rest.client import SiteClientBase
+from proof_of_concept.rest.compression import accept_encoding
+from proof_of_concept.rest.msgpack_encoding import MSGPACK_MEDIA_TYPE, unpack
+from proof_of_concept.rest.replication import update_accept_header
+from proof_of_concept.rest.serialization import (
+        deserialize_asset, deserialize_metadata, serialize,
+        validate_and_deserialize, validate_and_deserialize_binary)
+from proof_of_concept.rest.validation import Validator
+
+
+logger = logging.getLogger(__name__)
+
+
+T = TypeVar('T')
+
+
+_AsyncRestClientT = TypeVar('_AsyncRestClientT', bound='AsyncRestClient')
+
+
+def create_http_client(max_connections: int = 100) -> httpx.AsyncClient:
+    """Creates an HTTP client for use with the clients below.
+
+    The client keeps connections alive and pools them, so it is best
+    shared between clients used from the same event loop.
+
+    Args:
+        max_connections: Maximum number of connections to keep open in
+            total.
+
+    Returns:
+        A new HTTP client.
+    """
+    return httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections),
+            headers={'Accept-Encoding': accept_encoding(
+                'zstd' in SUPPORTED_DECODERS)})
+
+
+class AsyncRestClient:
+    """Base class for asynchronous REST clients.
+
+    Clients can be used as async context managers, or closed
+    explicitly using aclose(). If an HTTP client was passed in, then
+    it is left open, as it may be shared.
+    """
+    def __init__(self, http_client: Optional[httpx.AsyncClient]) -> None:
+        """Create an AsyncRestClient.
+
+        Args:
+            http_client: The HTTP client to use, if not given, a new
+                one is made.
+        """
+        self._owns_http_client = http_client is None
+        if http_client is None:
+            http_client = create_http_client()
+        self._http = http_client
+
+    async def aclose(self) -> None:
+        """Close the client and release its connections."""
+        if self._owns_http_client:
+            await self._http.aclose()
+
+    async def _post_json(self, url: str, obj: Any) -> httpx.Response:
+        """Sends a POST request with a body encoded by json_codec.
+
+        Args:
+            url: The URL to send the request to.
+            obj: The JSON-compatible object to send.
+        """
+        return await self._http.post(
+                url, content=json_codec.dumps(obj),
+                headers={'Content-Type': json_codec.JSON_MEDIA_TYPE})
+
+    async def __aenter__(self: _AsyncRestClientT) -> _AsyncRestClientT:
+        """Enter an async context."""
+        return self
+
+    async def __aexit__(
+            self, exc_type: Optional[Type[BaseException]],
+            exc_value: Optional[BaseException],
+            traceback: Optional[TracebackType]) -> None:
+        """Exit an async context, closing the client."""
+        await self.aclose()
+
+
+class AsyncSiteRestClient(AsyncRestClient, SiteClientBase):
+    """Handles connecting to other sites' runners and stores."""
+    def __init__(
+            self, site: str, site_validator: Validator,
+            registry_client: RegistryClient,
+            http_client: Optional[httpx.AsyncClient] = None,
+            chunk_size: int = 65536
+            ) -> None:
+        """Create an AsyncSiteRestClient.
+
+        Args:
+            site: The site at which this client acts.
+            site_validator: A validator for the Site REST API.
+            registry_client: A registry client to get sites from.
+            http_client: The HTTP client to use, if not given, a new
+                one is made.
+            chunk_size: Size of the chunks to buffer asset data in, in
+                bytes.
+
+        """
+        AsyncRestClient.__init__(self, http_client)
+        SiteClientBase.__init__(
+                self, site, site_validator, registry_client, chunk_size)
+
+    async def retrieve_asset(
+            self, site_id: Identifier, asset_id: Identifier) -> Asset:
+        """Obtains an asset from a store.
+
+        Args:
+            site_id: The site to get the asset from.
+            asset_id: The asset to get.
+
+        Returns:
+            The asset.
+
+        Raises:
+            KeyError: If the asset was not found.
+
+        """
+        r = await self._get_asset_resource(site_id, asset_id, '')
+        asset_json = json_codec.loads(r.content)
+        self._site_validator.validate('Asset', asset_json)
+        job = await self._retrieve_job(
+                site_id, asset_json['metadata']['job_id'])
+        return deserialize_asset(asset_json, job)
+
+    async def retrieve_asset_metadata(
+            self, site_id: Identifier, asset_id: Identifier) -> Metadata:
+        """Obtains an asset's metadata from a store.
+
+        Args:
+            site_id: The site to get the metadata from.
+            asset_id: The asset to get the metadata of.
+
+        Returns:
+            The metadata of the asset.
+
+        Raises:
+            KeyError: If the asset was not found.
+
+        """
+        r = await self._get_asset_resource(site_id, asset_id, '/metadata')
+        metadata_json = json_codec.loads(r.content)
+        self._site_validator.validate('Metadata', metadata_json)
+        job = await self._retrieve_job(site_id, metadata_json['job_id'])
+        return deserialize_metadata(metadata_json, job)
+
+    async def stream_asset(
+            self, site_id: Identifier, asset_id: Identifier) -> Asset:
+        """Obtains an asset from a store, streaming its data.
+
+        See SiteRestClient.stream_asset().
+
+        Args:
+            site_id: The site to get the asset from.
+            asset_id: The asset to get.
+
+        Returns:
+            The asset.
+
+        Raises:
+            KeyError: If the asset was not found.
+
+        """
+        metadata = await self.retrieve_asset_metadata(site_id, asset_id)
+        url = self._asset_url(site_id, asset_id, '/image')
+        headers = {'Accept': f'{ARRAY_MEDIA_TYPE}, application/json;q=0.5'}
+        with SpooledTemporaryFile(max_size=self._chunk_size) as buf:
+            async with self._http.stream(
+                    'GET', url, params={'requester': self._site},
+                    headers=headers) as r:
+                self._check_asset_response(r)
+                async for chunk in r.aiter_bytes(self._chunk_size):
+                    buf.write(chunk)
+                media_type = r.headers.get('Content-Type', 'application/json')
+
+            buf.seek(0)
+            if media_type.startswith(ARRAY_MEDIA_TYPE):
+                data = decode_array(media_type, buf.read())
+            else:
+                data = json_codec.loads(buf.read())
+
+        if data is None:
+            return ComputeAsset(asset_id, data, metadata)
+        return DataAsset(asset_id, data, metadata)
+
+    async def submit_job(
+            self, site_id: Identifier, submission: JobSubmission) -> None:
+        """Submits a job for execution to a local runner.
+
+        Args:
+            site_id: The site to submit to.
+            submission: The job submision to send.
+
+        """
+        endpoint = self._runner_endpoint(site_id)
+        await self._post_json(f'{endpoint}/jobs', serialize(submission))
+
+    async def _retrieve_job(self, site_id: Identifier, job_id: str) -> Job:
+        """Obtains a job by its content hash, downloading it if needed.
+
+        Args:
+            site_id: The site to download the job from.
+            job_id: The content hash of the job.
+
+        Returns:
+            The job.
+
+        Raises:
+            RuntimeError: If the job could not be obtained.
+
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            r = await self._http.get(
+                    self._job_url(site_id, job_id),
+                    params={'requester': self._site})
+            if not r.is_success:
+                raise RuntimeError(
+                        f'Could not get job {job_id} from {site_id}')
+            job = self._add_job(site_id, job_id, json_codec.loads(r.content))
+        return job
+
+    async def _get_asset_resource(
+            self, site_id: Identifier, asset_id: Identifier, suffix: str
+            ) -> httpx.Response:
+        """Request an asset resource from the site storing it.
+
+        Args:
+            site_id: The site to request from.
+            asset_id: The asset to request.
+            suffix: Subpath of the asset to request.
+
+        Returns:
+            The successful response.
+
+        Raises:
+            KeyError: If the asset was not found.
+
+        """
+        r = await self._http.get(
+                self._asset_url(site_id, asset_id, suffix),
+                params={'requester': self._site})
+        self._check_asset_response(r)
+        return r
+
+    def _check_asset_response(self, r: httpx.Response) -> None:
+        """Raises if the response indicates an error.
+
+        Raises:
+            KeyError: If the asset was not found.
+            RuntimeError: If there was a server error.
+
+        """
+        if r.status_code == 404:
+            raise KeyError('Asset not found')
+        elif not r.is_success:
+            raise RuntimeError('Server error when retrieving asset')
+
+
+class AsyncReplicationRestClient(AsyncRestClient, Generic[T]):
+    """Client for a ReplicationHandler REST endpoint."""
+    UpdateType = ReplicaUpdate[T]   # type: Type[ReplicaUpdate[T]]
+
+    def __init__(
+            self, endpoint: str, validator: Validator,
+            http_client: Optional[httpx.AsyncClient] = None
+            ) -> None:
+        """Create an AsyncReplicationRestClient.
+
+        See ReplicationRestClient for how to set UpdateType.
+
+        Args:
+            endpoint: URL of the endpoint to connect to.
+            validator: Validator to use to validate incoming updates.
+            http_client: The HTTP client to use, if not given, a new
+                one is made.
+        """
+        super().__init__(http_client)
+        self._endpoint = endpoint
+        self._validator = validator
+
+    async def get_updates_since(
+            self, from_version: Optional[int]) -> ReplicaUpdate[T]:
+        """Get updates since the given version.
+
+        Args:
+            from_version: Version to start at, None to get all updates.
+        """
+        params = dict()     # type: Dict[str, int]
+        if from_version is not None:
+            params['from_version'] = from_version
+
+        r = await self._retry_http_get(params)
+
+        content_type = r.headers.get('Content-Type', '')
+        if content_type.startswith(MSGPACK_MEDIA_TYPE):
+            update_data = unpack(r.content)
+            return validate_and_deserialize_binary(
+                    self._validator, self.UpdateType, update_data)
+
+        update_json = json_codec.loads(r.content)
+        logger.info('Replication update: %s', Summary(update_json))
+        return validate_and_deserialize(
+                self._validator, self.UpdateType.__name__, self.UpdateType,
+                update_json)
+
+    async def _retry_http_get(
+            self, params: Dict[str, int], max_delay: float = 20.0,
+            wait: float = 0.5) -> httpx.Response:
+        """Do an HTTP get and retry for a while on failure.
+
+        Args:
+            params: Query parameters to send.
+            max_delay: Time in seconds after which to give up.
+            wait: Time in seconds to wait between attempts.
+
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_delay
+        while True:
+            try:
+                return await self._http.get(
+                        self._endpoint, params=params,
+                        headers=update_accept_header())
+            except httpx.TransportError:
+                if loop.time() + wait > deadline:
+                    raise
+                await asyncio.sleep(wait)
+
+
+class AsyncPolicyRestClient(AsyncReplicationRestClient[Rule]):
+    """An asynchronous client for policy servers."""
+    UpdateType = PolicyUpdate
+
+
+class AsyncRegistryRestClient(AsyncReplicationRestClient[RegisteredObject]):
+    """An asynchronous client for the registry."""
+    UpdateType = RegistryUpdate
+
+
+class AsyncRegistryClient(AsyncRestClient):
+    """Asynchronous interface for (de)registering with the registry."""
+    def __init__(
+            self, endpoint: str = 'http://localhost:4413',
+            http_client: Optional[httpx.AsyncClient] = None
+            ) -> None:
+        """Create an AsyncRegistryClient.
+
+        Args:
+            endpoint: URL of the registry's REST endpoint.
+            http_client: The HTTP client to use, if not given, a new
+                one is made.
+
+        """
+        super().__init__(http_client)
+        self._registry_endpoint = endpoint
+
+    async def register_party(self, description: PartyDescription) -> None:
+        """Register a party with the Registry.
+
+        Args:
+            description: Description of the party.
+
+        """
+        await self._post_json(
+                self._registry_endpoint + '/parties', serialize(description))
+
+    async def deregister_party(self, party: Identifier) -> None:
+        """Deregister a party with the Registry.
+
+        Args:
+            party: The party to deregister.
+
+        """
+        r = await self._http.delete(
+                f'{self._registry_endpoint}/parties/{party}')
+        if r.status_code == 404:
+            raise KeyError('Party not found')
+
+    async def register_site(self, description: SiteDescription) -> None:
+        """Register a site with the Registry.
+
+        Args:
+            description: Description of the site.
+
+        """
+        await self._post_json(
+                self._registry_endpoint + '/sites', serialize(description))
+
+    async def deregister_site(self, site: Identifier) -> None:
+        """Deregister a site with the Registry.
+
+        Args:
+            site: The site to deregister.
+
+        """
+        r = await self._http.delete(
+                f'{self._registry_endpoint}/sites/{site}')
+        if r.status_code == 404:
+            raise KeyError('Site not found')
@@ -1,56 +1,265 @@
 """Clients for REST APIs."""
-import requests
+from tempfile import SpooledTemporaryFile
+from typing import Dict, IO, Optional
 from urllib.parse import quote
 
+import requests
+
 from proof_of_concept.definitions.identifier import Identifier
-from proof_of_concept.definitions.assets import Asset
-from proof_of_concept.definitions.workflows import JobSubmission
-from proof_of_concept.rest.serialization import deserialize, serialize
+from proof_of_concept.definitions.assets import (
+        Asset, ComputeAsset, DataAsset, Metadata)
+from proof_of_concept.definitions.workflows import Job, JobSubmission
+from proof_of_concept.rest import json_codec
+from proof_of_concept.rest.array_encoding import (
+        ARRAY_MEDIA_TYPE, decode_array)
+from proof_of_concept.rest.connections import ConnectionPool, default_pool
+from proof_of_concept.rest.definitions import JSON
+from proof_of_concept.rest.serialization import (
+        deserialize_asset, deserialize_metadata, serialize,
+        validate_and_deserialize)
 from proof_of_concept.rest.validation import Validator
 from proof_of_concept.components.registry_client import RegistryClient
 
 
-class SiteRestClient:
-    """Handles connecting to other sites' runners and stores."""
+class SiteClientBase:
+    """Transport-independent parts of the site REST clients.
+
+    This is shared by SiteRestClient and AsyncSiteRestClient, which
+    add the HTTP requests.
+
+    Asset metadata refers to jobs by their content hash. The jobs
+    themselves are downloaded when first needed and then cached, up to
+    a maximum number, after which the cache is cleared.
+    """
+    # Maximum number of jobs to cache
+    _job_cache_size = 1024
+
     def __init__(
             self, site: str, site_validator: Validator,
-            registry_client: RegistryClient
-            ) -> None:
-        """Create a SiteRestClient.
+            registry_client: RegistryClient, chunk_size: int) -> None:
+        """Create a SiteClientBase.
 
         Args:
             site: The site at which this client acts.
             site_validator: A validator for the Site REST API.
             registry_client: A registry client to get sites from.
+            chunk_size: Size of chunks to transfer asset data in, in
+                bytes.
 
         """
         self._site = site
         self._site_validator = site_validator
         self._registry_client = registry_client
+        self._chunk_size = chunk_size
+        self._jobs = dict()     # type: Dict[str, Job]
 
-    def retrieve_asset(self, site_id: Identifier, asset_id: Identifier
-                       ) -> Asset:
-        """Obtains an asset from a store."""
+    def _runner_endpoint(self, site_id: Identifier) -> str:
+        """Returns the REST endpoint of a site with a runner.
+
+        Args:
+            site_id: The site to look up.
+
+        Raises:
+            RuntimeError: If the site was not found.
+            ValueError: If the site does not have a runner.
+
+        """
+        try:
+            site = self._registry_client.get_site_by_id(site_id)
+        except KeyError:
+            raise RuntimeError(f'Site or runner at site {site_id} not found')
+
+        if not site.runner:
+            raise ValueError(f'Site {site_id} does not have a runner')
+        return site.endpoint
+
+    def _store_endpoint(self, site_id: Identifier) -> str:
+        """Returns the REST endpoint of a site with a store.
+
+        Args:
+            site_id: The site to look up.
+
+        Raises:
+            RuntimeError: If the site was not found.
+            ValueError: If the site does not have a store.
+
+        """
         try:
             site = self._registry_client.get_site_by_id(site_id)
         except KeyError:
             raise RuntimeError(f'Site or store at site {site_id} not found')
 
-        if site.store is not None:
-            safe_asset_id = quote(asset_id, safe='')
-            r = requests.get(
-                    f'{site.endpoint}/assets/{safe_asset_id}',
-                    params={'requester': self._site})
-            if r.status_code == 404:
-                raise KeyError('Asset not found')
-            elif not r.ok:
-                raise RuntimeError('Server error when retrieving asset')
+        if not site.store:
+            raise ValueError(f'Site {site_id} does not have a store')
+        return site.endpoint
+
+    def _asset_url(
+            self, site_id: Identifier, asset_id: Identifier, suffix: str
+            ) -> str:
+        """Returns the URL of an asset resource.
+
+        Args:
+            site_id: The site storing the asset.
+            asset_id: The asset to refer to.
+            suffix: Subpath of the asset, e.g. '/metadata' or the empty
+                string for the asset itself.
+
+        """
+        safe_asset_id = quote(asset_id, safe='')
+        return (
+                f'{self._store_endpoint(site_id)}/assets/{safe_asset_id}'
+                f'{suffix}')
+
+    def _job_url(self, site_id: Identifier, job_id: str) -> str:
+        """Returns the URL of a job record.
+
+        Args:
+            site_id: The site to get the job from.
+            job_id: The content hash of the job.
+
+        """
+        safe_job_id = quote(job_id, safe='')
+        return f'{self._store_endpoint(site_id)}/jobs/{safe_job_id}'
+
+    def _add_job(
+            self, site_id: Identifier, job_id: str, job_json: JSON) -> Job:
+        """Checks and deserializes a downloaded job, and caches it.
+
+        Since jobs are identified by their contents, a job can be
+        cached and reused whichever site referred to it, as long as we
+        check that what we downloaded matches the hash.
+
+        Args:
+            site_id: The site the job came from.
+            job_id: The content hash of the job.
+            job_json: The job as received.
+
+        Returns:
+            The job.
+
+        Raises:
+            ValidationError: If the job was invalid.
+            RuntimeError: If the job does not match its hash.
+
+        """
+        job = validate_and_deserialize(
+                self._site_validator, 'Job', Job, job_json)
+        if job.content_hash() != job_id:
+            raise RuntimeError(f'Site {site_id} sent an invalid job')
+
+        if len(self._jobs) >= self._job_cache_size:
+            self._jobs.clear()
+        self._jobs[job_id] = job
+        return job
+
+
+class SiteRestClient(SiteClientBase):
+    """Handles connecting to other sites' runners and stores."""
+    def __init__(
+            self, site: str, site_validator: Validator,
+            registry_client: RegistryClient,
+            connection_pool: Optional[ConnectionPool] = None,
+            chunk_size: int = 65536
+            ) -> None:
+        """Create a SiteRestClient.
+
+        Args:
+            site: The site at which this client acts.
+            site_validator: A validator for the Site REST API.
+            registry_client: A registry client to get sites from.
+            connection_pool: Pool of HTTP connections to use, if not
+                given, a process-wide pool is shared.
+            chunk_size: Size of chunks to transfer asset data in, in
+                bytes.
 
-            asset_json = r.json()
-            self._site_validator.validate('Asset', asset_json)
-            return deserialize(Asset, asset_json)
+        """
+        super().__init__(site, site_validator, registry_client, chunk_size)
+        if connection_pool is None:
+            connection_pool = default_pool
+        self._connections = connection_pool
 
-        raise ValueError(f'Site {site_id} does not have a store')
+    def retrieve_asset(self, site_id: Identifier, asset_id: Identifier
+                       ) -> Asset:
+        """Obtains an asset from a store."""
+        r = self._get_asset_resource(site_id, asset_id, '')
+        asset_json = json_codec.loads(r.content)
+        self._site_validator.validate('Asset', asset_json)
+        job = self._retrieve_job(site_id, asset_json['metadata']['job_id'])
+        return deserialize_asset(asset_json, job)
+
+    def retrieve_asset_metadata(
+            self, site_id: Identifier, asset_id: Identifier) -> Metadata:
+        """Obtains an asset's metadata from a store.
+
+        Args:
+            site_id: The site to get the metadata from.
+            asset_id: The asset to get the metadata of.
+
+        Returns:
+            The metadata of the asset.
+
+        Raises:
+            KeyError: If the asset was not found.
+
+        """
+        r = self._get_asset_resource(site_id, asset_id, '/metadata')
+        metadata_json = json_codec.loads(r.content)
+        self._site_validator.validate('Metadata', metadata_json)
+        job = self._retrieve_job(site_id, metadata_json['job_id'])
+        return deserialize_metadata(metadata_json, job)
+
+    def download_asset_data(
+            self, site_id: Identifier, asset_id: Identifier,
+            target: IO[bytes]) -> None:
+        """Downloads an asset's data from a store, in chunks.
+
+        The data is written to the target as JSON text while it comes
+        in, so that it is never held in memory as a whole.
+
+        Args:
+            site_id: The site to get the data from.
+            asset_id: The asset to get the data of.
+            target: A binary file or buffer to write the data to.
+
+        Raises:
+            KeyError: If the asset was not found.
+
+        """
+        self._download_image(site_id, asset_id, target, 'application/json')
+
+    def stream_asset(
+            self, site_id: Identifier, asset_id: Identifier) -> Asset:
+        """Obtains an asset from a store, streaming its data.
+
+        This retrieves the metadata and the data separately, with the
+        data buffered in a temporary file if it is large. Numeric data
+        is transferred as a binary array if the server supports it.
+
+        Args:
+            site_id: The site to get the asset from.
+            asset_id: The asset to get.
+
+        Returns:
+            The asset.
+
+        Raises:
+            KeyError: If the asset was not found.
+
+        """
+        metadata = self.retrieve_asset_metadata(site_id, asset_id)
+        with SpooledTemporaryFile(max_size=self._chunk_size) as buf:
+            media_type = self._download_image(
+                    site_id, asset_id, buf,
+                    f'{ARRAY_MEDIA_TYPE}, application/json;q=0.5')
+            buf.seek(0)
+            if media_type.startswith(ARRAY_MEDIA_TYPE):
+                data = decode_array(media_type, buf.read())
+            else:
+                data = json_codec.loads(buf.read())
+
+        if data is None:
+            return ComputeAsset(asset_id, data, metadata)
+        return DataAsset(asset_id, data, metadata)
 
     def submit_job(
             self, site_id: Identifier, submission: JobSubmission) -> None:
@@ -61,12 +270,88 @@ class SiteRestClient:
             submission: The job submision to send.
 
         """
-        try:
-            site = self._registry_client.get_site_by_id(site_id)
-        except KeyError:
-            raise RuntimeError(f'Site or runner at site {site_id} not found')
+        endpoint = self._runner_endpoint(site_id)
+        self._connections.post(f'{endpoint}/jobs', json=serialize(submission))
 
-        if site.runner:
-            requests.post(f'{site.endpoint}/jobs', json=serialize(submission))
-        else:
-            raise ValueError(f'Site {site_id} does not have a runner')
+    def _download_image(
+            self, site_id: Identifier, asset_id: Identifier,
+            target: IO[bytes], accept: str) -> str:
+        """Downloads an asset's data from a store, in chunks.
+
+        Args:
+            site_id: The site to get the data from.
+            asset_id: The asset to get the data of.
+            target: A binary file or buffer to write the data to.
+            accept: Value for the Accept header of the request.
+
+        Returns:
+            The media type of the data written to target.
+
+        Raises:
+            KeyError: If the asset was not found.
+
+        """
+        with self._get_asset_resource(
+                site_id, asset_id, '/image', stream=True,
+                headers={'Accept': accept}) as r:
+            for chunk in r.iter_content(chunk_size=self._chunk_size):
+                target.write(chunk)
+            return str(r.headers.get('Content-Type', 'application/json'))
+
+    def _retrieve_job(self, site_id: Identifier, job_id: str) -> Job:
+        """Obtains a job by its content hash, downloading it if needed.
+
+        Args:
+            site_id: The site to download the job from.
+            job_id: The content hash of the job.
+
+        Returns:
+            The job.
+
+        Raises:
+            RuntimeError: If the job could not be obtained.
+
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            r = self._connections.get(
+                    self._job_url(site_id, job_id),
+                    params={'requester': self._site})
+            if not r.ok:
+                raise RuntimeError(
+                        f'Could not get job {job_id} from {site_id}')
+            job = self._add_job(site_id, job_id, json_codec.loads(r.content))
+        return job
+
+    def _get_asset_resource(
+            self, site_id: Identifier, asset_id: Identifier, suffix: str,
+            stream: bool = False, headers: Optional[Dict[str, str]] = None
+            ) -> requests.Response:
+        """Request an asset resource from the site storing it.
+
+        Args:
+            site_id: The site to request from.
+            asset_id: The asset to request.
+            suffix: Subpath of the asset to request, e.g. '/metadata'
+                or the empty string for the asset itself.
+            stream: Whether to stream the response body.
+            headers: Additional headers to send with the request.
+
+        Returns:
+            The successful response.
+
+        Raises:
+            KeyError: If the asset was not found.
+
+        """
+        r = self._connections.get(
+                self._asset_url(site_id, asset_id, suffix),
+                params={'requester': self._site}, stream=stream,
+                headers=headers)
+        if r.status_code == 404:
+            r.close()
+            raise KeyError('Asset not found')
+        elif not r.ok:
+            r.close()
+            raise RuntimeError('Server error when retrieving asset')
+        return r
@@ -0,0 +1,162 @@
+"""Negotiated compression of HTTP responses.
+
+Responses are compressed with gzip, or with zstd if the zstandard
+package is installed, whenever the client says it accepts that. On
+the client side, the HTTP library decodes these transparently, so all
+we need to do there is to tell the server what it can handle. All of
+them decode gzip, but only recent versions decode zstd, and only if
+their own zstd dependency is installed.
+"""
+import gzip
+from typing import Any, Dict, Generator, Iterable, List, Optional
+import zlib
+
+from falcon import Request, Response
+
+try:
+    import zstandard
+except ImportError:     # pragma: no cover
+    zstandard = None
+
+
+def _supported_encodings() -> List[str]:
+    """Returns the encodings we can compress with, by preference."""
+    if zstandard is not None:
+        return ['zstd', 'gzip']
+    return ['gzip']
+
+
+def accept_encoding(decodes_zstd: bool) -> str:
+    """Returns a value for the Accept-Encoding header of requests.
+
+    Args:
+        decodes_zstd: Whether the HTTP library sending the requests
+            decodes zstd. If not, a zstd response would be passed on
+            undecoded, so only gzip is offered.
+    """
+    if decodes_zstd:
+        return 'zstd, gzip'
+    return 'gzip'
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parses an Accept-Encoding header.
+
+    Args:
+        header: Value of the header.
+
+    Returns:
+        A dict mapping encodings to their quality values.
+    """
+    result = dict()     # type: Dict[str, float]
+    for item in header.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        result[coding.lower()] = quality
+    return result
+
+
+def _gzip_chunks(chunks: Iterable[bytes]) -> Generator[bytes, None, None]:
+    """Compresses a stream of chunks with gzip."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _zstd_chunks(chunks: Iterable[bytes]) -> Generator[bytes, None, None]:
+    """Compresses a stream of chunks with zstd."""
+    compressor = zstandard.ZstdCompressor().compressobj()
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+class CompressionMiddleware:
+    """Falcon middleware compressing responses.
+
+    Bodies smaller than a threshold are sent as-is, as compressing
+    them would save little or nothing. Streamed responses are of
+    unknown size, and are compressed on the fly if they are iterables
+    of chunks.
+    """
+    def __init__(self, min_size: int = 1024) -> None:
+        """Create a CompressionMiddleware.
+
+        Args:
+            min_size: Minimum size of a response body, in bytes, for it
+                to be compressed.
+        """
+        self._min_size = min_size
+
+    def process_response(
+            self, request: Request, response: Response, resource: Any,
+            req_succeeded: bool) -> None:
+        """Compresses the response, if appropriate.
+
+        Args:
+            request: The submitted request.
+            response: The response to compress.
+            resource: The resource that handled the request, if any.
+            req_succeeded: Whether the request was handled
+                successfully.
+        """
+        encoding = self._select_encoding(request)
+        if encoding is None or response.get_header('Content-Encoding'):
+            return
+
+        if response.stream is not None:
+            if hasattr(response.stream, 'read'):
+                return
+            if encoding == 'zstd':
+                response.stream = _zstd_chunks(response.stream)
+            else:
+                response.stream = _gzip_chunks(response.stream)
+        else:
+            body = response.render_body()
+            if body is None or len(body) < self._min_size:
+                return
+            if encoding == 'zstd':
+                response.data = zstandard.ZstdCompressor().compress(body)
+            else:
+                response.data = gzip.compress(body)
+            response.body = None
+
+        response.set_header('Content-Encoding', encoding)
+        response.append_header('Vary', 'Accept-Encoding')
+
+    def _select_encoding(self, request: Request) -> Optional[str]:
+        """Choose an encoding acceptable to the client.
+
+        Args:
+            request: The request to choose an encoding for.
+
+        Returns:
+            The name of the encoding, or None to not compress.
+        """
+        header = request.get_header('Accept-Encoding')
+        if header is None:
+            return None
+
+        accepted = _parse_accept_encoding(header)
+        best = None     # type: Optional[str]
+        best_quality = 0.0
+        for encoding in _supported_encodings():
+            quality = accepted.get(encoding, accepted.get('*', 0.0))
+            if quality > best_quality:
+                best = encoding
+                best_quality = quality
+        return best
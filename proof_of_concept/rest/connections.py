@@ -0,0 +1,182 @@
+"""Pooled HTTP connections for REST clients."""
+from threading import local, Lock
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+
+from proof_of_concept.rest import json_codec
+from proof_of_concept.rest.compression import accept_encoding
+
+
+class ConnectionStats:
+    """Statistics on the use of pooled connections.
+
+    Attributes:
+        requests: Number of requests made.
+        connections: Number of new connections opened.
+
+    """
+    def __init__(self, requests: int, connections: int) -> None:
+        """Create a ConnectionStats object.
+
+        Args:
+            requests: Number of requests made.
+            connections: Number of new connections opened.
+        """
+        self.requests = requests
+        self.connections = connections
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the object."""
+        return 'ConnectionStats({} requests, {} connections)'.format(
+                self.requests, self.connections)
+
+    @property
+    def reused(self) -> int:
+        """The number of requests that reused an existing connection."""
+        return self.requests - self.connections
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    """A urllib3 connection pool counting the connections it opens.
+
+    urllib3's own num_connections only counts new connection objects.
+    If the server closed a pooled connection, urllib3 reopens it
+    without counting that, which would make it look reused.
+    """
+    num_connects = 0
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        """Gets a connection, counting it if it will need to connect."""
+        conn = super()._get_conn(timeout)
+        if getattr(conn, 'sock', None) is None:
+            self.num_connects += 1
+        return conn
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    """An HTTPS version of _CountingHTTPConnectionPool."""
+    num_connects = 0
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        """Gets a connection, counting it if it will need to connect."""
+        conn = super()._get_conn(timeout)
+        if getattr(conn, 'sock', None) is None:
+            self.num_connects += 1
+        return conn
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """An HTTPAdapter using the counting connection pools."""
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """Creates the pool manager, see HTTPAdapter."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+                'http': _CountingHTTPConnectionPool,
+                'https': _CountingHTTPSConnectionPool}
+
+
+class ConnectionPool:
+    """Keeps HTTP connections to other sites open for reuse.
+
+    The connections themselves are kept in thread-safe pools shared by
+    all threads, one pool per peer. Each thread gets its own session
+    on top of those, as requests sessions are not guaranteed to be
+    thread-safe themselves. Sessions ask for compressed responses.
+
+    Connections are only reused if the server keeps them open, which
+    the wsgiref servers of SiteServer and RegistryServer do not. An
+    AsgiServer or a production WSGI server does.
+    """
+    def __init__(self, pool_size: int = 10) -> None:
+        """Create a ConnectionPool.
+
+        Args:
+            pool_size: Default maximum number of connections to keep
+                open to each peer.
+        """
+        self._adapters = {
+                'http://': _CountingHTTPAdapter(pool_maxsize=pool_size),
+                'https://': _CountingHTTPAdapter(pool_maxsize=pool_size)
+                }   # type: Dict[str, _CountingHTTPAdapter]
+        self._version = 0
+        self._lock = Lock()
+        self._local = local()
+
+    def set_pool_size(self, endpoint: str, pool_size: int) -> None:
+        """Set the number of connections to keep open to a peer.
+
+        Args:
+            endpoint: Base URL of the peer, e.g. a site's endpoint.
+            pool_size: Maximum number of connections to keep open.
+        """
+        with self._lock:
+            old_adapter = self._adapters.get(endpoint)
+            self._adapters[endpoint] = _CountingHTTPAdapter(
+                    pool_maxsize=pool_size)
+            self._version += 1
+        if old_adapter is not None:
+            old_adapter.close()
+
+    def session(self) -> requests.Session:
+        """Returns a session for the current thread."""
+        with self._lock:
+            if getattr(self._local, 'version', None) != self._version:
+                session = requests.Session()
+                session.headers['Accept-Encoding'] = accept_encoding(
+                        'zstd' in ACCEPT_ENCODING)
+                for prefix, adapter in self._adapters.items():
+                    session.mount(prefix, adapter)
+                self._local.session = session
+                self._local.version = self._version
+            return self._local.session     # type: ignore
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Sends a GET request over a pooled connection."""
+        return self.session().get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        """Sends a POST request over a pooled connection.
+
+        A body passed as json is encoded using json_codec.
+        """
+        if 'json' in kwargs:
+            kwargs['data'] = json_codec.dumps(kwargs.pop('json'))
+            kwargs['headers'] = {
+                    **kwargs.get('headers', {}),
+                    'Content-Type': json_codec.JSON_MEDIA_TYPE}
+        return self.session().post(url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> requests.Response:
+        """Sends a DELETE request over a pooled connection."""
+        return self.session().delete(url, **kwargs)
+
+    def stats(self) -> Dict[str, ConnectionStats]:
+        """Returns connection reuse statistics.
+
+        Only peers with currently pooled connections are included.
+
+        Returns:
+            A dict mapping peer host:port to statistics.
+        """
+        with self._lock:
+            adapters = list(self._adapters.values())
+
+        result = dict()     # type: Dict[str, ConnectionStats]
+        for adapter in adapters:
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                peer = f'{pool.host}:{pool.port}'
+                stats = result.setdefault(peer, ConnectionStats(0, 0))
+                stats.requests += pool.num_requests
+                stats.connections += pool.num_connects
+        return result
+
+
+default_pool = ConnectionPool()
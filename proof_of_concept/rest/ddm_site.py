@@ -1,43 +1,146 @@
 """REST-style API for a site."""
+import json
 import logging
 from pathlib import Path
-from threading import Thread
+from threading import Lock, Thread
 from socketserver import ThreadingMixIn
+from typing import Any, Dict, Generator, List, Optional, Set
+from weakref import WeakKeyDictionary, WeakValueDictionary
 from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
 
 from falcon import App, HTTP_200, HTTP_400, HTTP_404, Request, Response
-import ruamel.yaml as yaml
 import yatiml
 
 from proof_of_concept.components.ddm_site import Site
 from proof_of_concept.components.registry_client import RegistryClient
+from proof_of_concept.definitions.assets import Asset
 from proof_of_concept.definitions.identifier import Identifier
 from proof_of_concept.definitions.interfaces import IAssetStore, IStepRunner
 from proof_of_concept.definitions.policy import Rule
-from proof_of_concept.definitions.workflows import JobSubmission
+from proof_of_concept.definitions.workflows import Job, JobSubmission
+from proof_of_concept.logs import set_log_levels, Summary
 from proof_of_concept.policy.replication import PolicyStore
+from proof_of_concept.rest.array_encoding import (
+        ARRAY_MEDIA_TYPE, array_layout, array_media_type, encode_array)
+from proof_of_concept.rest.compression import CompressionMiddleware
+from proof_of_concept.rest.json_codec import use_fast_json
 from proof_of_concept.rest.replication import ReplicationHandler
-from proof_of_concept.rest.serialization import deserialize, serialize
-from proof_of_concept.rest.validation import Validator, ValidationError
+from proof_of_concept.rest.serialization import (
+        serialize, validate_and_deserialize)
+from proof_of_concept.rest.validation import (
+        load_validator, Validator, ValidationError)
 
 
 logger = logging.getLogger(__name__)
 
 
+def _encode_chunks(
+        data: Any, chunk_size: int = 65536) -> Generator[bytes, None, None]:
+    """Encodes data as JSON, a chunk at a time.
+
+    Args:
+        data: The data to encode.
+        chunk_size: Approximate size of the chunks to produce, in
+            bytes.
+
+    Returns:
+        A generator producing the JSON text in chunks.
+    """
+    parts = list()  # type: List[str]
+    size = 0
+    for part in json.JSONEncoder().iterencode(data):
+        parts.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield ''.join(parts).encode('utf-8')
+            parts = list()
+            size = 0
+    if parts:
+        yield ''.join(parts).encode('utf-8')
+
+
+class JobRecords:
+    """Jobs that assets sent by this site refer to.
+
+    Asset metadata refers to the job that produced the asset by its
+    content hash, so that the job does not have to be sent along with
+    every asset. Peers then request the job itself once, from here.
+
+    A job is only available to requesters which have been sent an
+    asset referring to it, as it describes where the asset came from.
+    Jobs are kept only as long as the assets referring to them. Of
+    equal jobs of different assets, the one of the asset sent last is
+    kept, so that it is there when the requester asks for it.
+    """
+    def __init__(self) -> None:
+        """Create an empty JobRecords."""
+        self._jobs = WeakValueDictionary(
+                )   # type: WeakValueDictionary[str, Job]
+        self._requesters = WeakKeyDictionary(
+                )   # type: WeakKeyDictionary[Job, Set[str]]
+        self._lock = Lock()
+
+    def add(self, job: Job, requester: str) -> None:
+        """Makes a job available to a requester.
+
+        Args:
+            job: The job to add.
+            requester: The site which was sent an asset referring to
+                the job.
+        """
+        job_id = job.content_hash()
+        with self._lock:
+            # Keep the job of the asset being sent, as an equal one we
+            # have may go away with its asset while this one is used.
+            old_job = self._jobs.get(job_id)
+            requesters = set()  # type: Set[str]
+            if old_job is not None:
+                requesters = self._requesters.pop(old_job, requesters)
+            requesters.add(requester)
+            self._jobs[job_id] = job
+            self._requesters[job] = requesters
+
+    def get(self, job_id: str, requester: str) -> Optional[Job]:
+        """Returns the job with the given content hash, if available.
+
+        Args:
+            job_id: Content hash of the job to get.
+            requester: The site requesting the job.
+
+        Returns:
+            The job, or None if it does not exist or the requester was
+            not sent an asset referring to it.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or requester not in self._requesters[job]:
+                return None
+            return job
+
+
 class AssetAccessHandler:
-    """A handler for the /assets endpoint."""
-    def __init__(self, store: IAssetStore) -> None:
+    """A handler for the /assets endpoint.
+
+    Besides the asset as a whole, this serves its metadata and its
+    data separately on the /metadata and /image subpaths. The data is
+    sent in chunks, so that large assets can be transferred without
+    encoding them into a single JSON document. Numeric data is sent as
+    a binary array instead of JSON if the client accepts that.
+    """
+    def __init__(self, store: IAssetStore, job_records: JobRecords) -> None:
         """Create an AssetAccessHandler handler.
 
         Args:
             store: The asset store to send requests to.
+            job_records: Records of the jobs sent assets refer to.
         """
         self._store = store
+        self._job_records = job_records
 
     def on_get(
             self, request: Request, response: Response, asset_id: str
             ) -> None:
-        """Handle request for an asset image.
+        """Handle request for an asset.
 
         Args:
             request: The submitted request.
@@ -45,33 +148,139 @@ class AssetAccessHandler:
             asset_id: The id of the requested asset
 
         """
-        logger.info(f'Asset access request, store = {self._store}')
+        asset = self._retrieve(request, response, asset_id)
+        if asset is not None:
+            self._job_records.add(
+                    asset.metadata.job, request.params['requester'])
+            response.media = serialize(asset)
+
+    def on_get_metadata(
+            self, request: Request, response: Response, asset_id: str
+            ) -> None:
+        """Handle request for an asset's metadata.
+
+        Args:
+            request: The submitted request.
+            response: A response object to configure.
+            asset_id: The id of the requested asset
+
+        """
+        asset = self._retrieve(request, response, asset_id)
+        if asset is not None:
+            self._job_records.add(
+                    asset.metadata.job, request.params['requester'])
+            response.media = serialize(asset.metadata)
+
+    def on_get_image(
+            self, request: Request, response: Response, asset_id: str
+            ) -> None:
+        """Handle request for an asset's data.
+
+        Args:
+            request: The submitted request.
+            response: A response object to configure.
+            asset_id: The id of the requested asset
+
+        """
+        asset = self._retrieve(request, response, asset_id)
+        if asset is not None:
+            layout = array_layout(asset.data)
+            preferred = request.client_prefers(
+                    [ARRAY_MEDIA_TYPE, 'application/json'])
+            if layout is not None and preferred == ARRAY_MEDIA_TYPE:
+                dtype, shape = layout
+                response.content_type = array_media_type(dtype, shape)
+                response.stream = encode_array(asset.data, dtype)
+            else:
+                response.content_type = 'application/json'
+                response.stream = _encode_chunks(asset.data)
+
+    def _retrieve(
+            self, request: Request, response: Response, asset_id: str
+            ) -> Optional[Asset]:
+        """Retrieve an asset from the store for a requester.
+
+        If the request is invalid or the asset is not available, this
+        configures the response accordingly and returns None.
+
+        Args:
+            request: The submitted request.
+            response: A response object to configure.
+            asset_id: The id of the requested asset
+
+        Returns:
+            The asset, or None if it will not be sent.
+
+        """
+        logger.info('Asset access request, store = %s', self._store)
+        if 'requester' not in request.params:
+            logger.info('Invalid asset access request')
+            response.status = HTTP_400
+            response.body = 'Invalid request'
+            return None
+
+        logger.info(
+                'Received request for asset %s from %s', asset_id,
+                request.params['requester'])
+        try:
+            asset = self._store.retrieve(
+                    Identifier(asset_id), request.params['requester'])
+            response.status = HTTP_200
+            return asset
+        except KeyError:
+            logger.info('Asset %s not found', asset_id)
+            response.status = HTTP_404
+            response.body = 'Asset not found'
+        except RuntimeError:
+            # This is permission denied, but we return a 404 to
+            # avoid information-leaking the existence of any
+            # particular assets.
+            logger.info(
+                    'Asset %s not available for user %s', asset_id,
+                    request.params['requester'])
+            response.status = HTTP_404
+            response.body = 'Asset not found'
+        return None
+
+
+class JobRecordHandler:
+    """A handler for the /jobs/{job_id} endpoint."""
+    def __init__(self, job_records: JobRecords) -> None:
+        """Create a JobRecordHandler.
+
+        Args:
+            job_records: The job records to serve.
+        """
+        self._job_records = job_records
+
+    def on_get(
+            self, request: Request, response: Response, job_id: str
+            ) -> None:
+        """Handle request for a job record.
+
+        Args:
+            request: The submitted request.
+            response: A response object to configure.
+            job_id: Content hash of the requested job.
+
+        """
         if 'requester' not in request.params:
-            logger.info(f'Invalid asset access request')
+            logger.info('Invalid job record request')
             response.status = HTTP_400
             response.body = 'Invalid request'
-        else:
+            return
+
+        # As for assets, we return a 404 if the requester may not have
+        # the job, so as not to leak its existence.
+        job = self._job_records.get(job_id, request.params['requester'])
+        if job is None:
             logger.info(
-                    f'Received request for asset {asset_id} from'
-                    f' {request.params["requester"]}')
-            try:
-                asset = self._store.retrieve(
-                        Identifier(asset_id), request.params['requester'])
-                response.status = HTTP_200
-                response.media = serialize(asset)
-            except KeyError:
-                logger.info(f'Asset {asset_id} not found')
-                response.status = HTTP_404
-                response.body = 'Asset not found'
-            except RuntimeError:
-                # This is permission denied, but we return a 404 to
-                # avoid information-leaking the existence of any
-                # particular assets.
-                logger.info(
-                        f'Asset {asset_id} not available for user'
-                        f' {request.params["requester"]}')
-                response.status = HTTP_404
-                response.body = 'Asset not found'
+                    'Job record %s not found or not available for %s',
+                    job_id, request.params['requester'])
+            response.status = HTTP_404
+            response.body = 'Job not found'
+            return
+        response.media = serialize(job)
 
 
 class WorkflowExecutionHandler:
@@ -97,12 +306,16 @@ class WorkflowExecutionHandler:
 
         """
         try:
-            logger.info(f'Received execution request: {request.media}')
-            self._validator.validate('JobSubmission', request.media)
-            submission = deserialize(JobSubmission, request.media)
+            logger.info(
+                    'Received execution request: %s',
+                    Summary(request.media))
+            submission = validate_and_deserialize(
+                    self._validator, 'JobSubmission', JobSubmission,
+                    request.media)
             self._runner.execute_job(submission)
         except ValidationError:
-            logger.warning(f'Invalid execution request: {request.media}')
+            logger.warning(
+                    'Invalid execution request: %s', Summary(request.media))
             response.status = HTTP_400
             response.body = 'Invalid request'
 
@@ -127,22 +340,27 @@ class SiteRestApi:
             runner: The workflow runner to send requests to.
 
         """
-        self.app = App()
+        self.app = App(middleware=[CompressionMiddleware()])
+        use_fast_json(self.app)
 
         site_api_file = Path(__file__).parent / 'site_api.yaml'
-        with open(site_api_file, 'r') as f:
-            site_api_def = yaml.safe_load(f.read())
-
-        validator = Validator(site_api_def)
+        validator = load_validator(site_api_file)
 
         rule_replication = ReplicationHandler[Rule](policy_store)
         self.app.add_route('/rules/updates', rule_replication)
 
-        asset_access = AssetAccessHandler(asset_store)
+        job_records = JobRecords()
+        asset_access = AssetAccessHandler(asset_store, job_records)
         self.app.add_route('/assets/{asset_id}', asset_access)
+        self.app.add_route(
+                '/assets/{asset_id}/metadata', asset_access,
+                suffix='metadata')
+        self.app.add_route(
+                '/assets/{asset_id}/image', asset_access, suffix='image')
 
         workflow_execution = WorkflowExecutionHandler(runner, validator)
         self.app.add_route('/jobs', workflow_execution)
+        self.app.add_route('/jobs/{job_id}', JobRecordHandler(job_records))
 
 
 class ThreadingWSGIServer (ThreadingMixIn, WSGIServer):
@@ -197,11 +415,14 @@ class Settings:
         namespace: Namespace controlled by the site's policy server.
         owner: Party owning the site.
         registry_endpoint: Registry endpoint location.
+        log_levels: Log levels per subsystem, keyed by logger name,
+            see set_log_levels().
     """
     def __init__(
             self,
             name: str, namespace: str, owner: Identifier,
-            registry_endpoint: str
+            registry_endpoint: str,
+            log_levels: Optional[Dict[str, str]] = None
             ) -> None:
         """Create a Settings object.
 
@@ -210,11 +431,14 @@ class Settings:
             namespace: Namespace controlled by the site's policy server.
             owner: Party owning the site.
             registry_endpoint: Registry endpoint location.
+            log_levels: Log levels per subsystem, keyed by logger name,
+                e.g. {'proof_of_concept.rest': 'WARNING'}.
         """
         self.name = name
         self.namespace = namespace
         self.owner = owner
         self.registry_endpoint = registry_endpoint
+        self.log_levels = log_levels
 
 
 load_settings = yatiml.load_function(Settings, Identifier)
@@ -226,6 +450,8 @@ default_config_location = Path('/etc/mahiru/mahiru.conf')
 def wsgi_app() -> App:
     """Creates a WSGI app for a WSGI runner."""
     settings = load_settings(default_config_location)
+    if settings.log_levels is not None:
+        set_log_levels(settings.log_levels)
 
     registry_client = RegistryClient(settings.registry_endpoint)
     site = Site(
@@ -0,0 +1,71 @@
+"""Fast encoding and decoding of JSON.
+
+This uses orjson if it is installed, which is several times faster
+than the standard library's json module, and falls back to the latter
+otherwise. Both the server side (falcon's media handlers) and the
+clients go through the functions here.
+"""
+import json
+from typing import Any, Union
+
+from falcon import App
+from falcon.media import JSONHandler
+
+try:
+    import orjson
+except ImportError:     # pragma: no cover
+    orjson = None   # type: ignore
+
+
+JSON_MEDIA_TYPE = 'application/json'
+
+
+def dumps(obj: Any) -> bytes:
+    """Encodes an object as JSON.
+
+    Args:
+        obj: The object to encode, consisting of dicts, lists, strings,
+            numbers, booleans and None.
+
+    Returns:
+        The UTF-8 encoded JSON text.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            # e.g. integers that do not fit in 64 bits
+            pass
+    return json.dumps(obj).encode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decodes JSON.
+
+    Args:
+        data: The JSON text, as UTF-8 encoded bytes or as a string.
+
+    Returns:
+        The decoded object.
+
+    Raises:
+        ValueError: If the data is not valid JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # also a ValueError, but the stdlib gives better messages
+            pass
+    return json.loads(data)
+
+
+def use_fast_json(app: App) -> None:
+    """Makes a falcon app use the functions above for JSON media.
+
+    Args:
+        app: The app to configure.
+    """
+    handler = JSONHandler(dumps=dumps, loads=loads)
+    app.req_options.media_handlers[JSON_MEDIA_TYPE] = handler
+    app.resp_options.media_handlers[JSON_MEDIA_TYPE] = handler
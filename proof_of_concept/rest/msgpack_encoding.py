@@ -0,0 +1,53 @@
+"""MessagePack encoding of replica updates.
+
+Replica updates can be sent as MessagePack rather than as JSON, if the
+client asks for it. This carries rule signatures and public keys as raw
+bytes (see serialize_binary()), which makes updates smaller and saves
+base64 encoding and decoding on both ends.
+
+This requires the optional msgpack package. Without it, servers send
+and clients ask for JSON only.
+"""
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:     # pragma: no cover
+    msgpack = None
+
+
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+
+
+def msgpack_available() -> bool:
+    """Returns whether MessagePack can be used."""
+    return msgpack is not None
+
+
+def pack(obj: Any) -> bytes:
+    """Encodes an object as MessagePack.
+
+    Args:
+        obj: The object to encode, consisting of dicts, lists, strings,
+            bytes, numbers, booleans and None.
+
+    Returns:
+        The encoded object.
+    """
+    packed = msgpack.packb(obj, use_bin_type=True)    # type: bytes
+    return packed
+
+
+def unpack(data: bytes) -> Any:
+    """Decodes MessagePack.
+
+    Args:
+        data: The encoded object.
+
+    Returns:
+        The decoded object.
+
+    Raises:
+        ValueError: If the data could not be decoded.
+    """
+    return msgpack.unpackb(data, raw=False)
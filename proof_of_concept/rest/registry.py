@@ -8,15 +8,17 @@ from wsgiref.simple_server import WSGIServer, WSGIRequestHandler
 from falcon import (
         App, HTTP_200, HTTP_201, HTTP_400, HTTP_404, HTTP_409, Request,
         Response)
-import ruamel.yaml as yaml
 
 from proof_of_concept.definitions.identifier import Identifier
 from proof_of_concept.definitions.registry import (
         PartyDescription, RegisteredObject, SiteDescription)
 from proof_of_concept.registry.registry import Registry
+from proof_of_concept.rest.compression import CompressionMiddleware
+from proof_of_concept.rest.json_codec import use_fast_json
 from proof_of_concept.rest.replication import ReplicationHandler
-from proof_of_concept.rest.serialization import deserialize
-from proof_of_concept.rest.validation import Validator, ValidationError
+from proof_of_concept.rest.serialization import validate_and_deserialize
+from proof_of_concept.rest.validation import (
+        load_validator, Validator, ValidationError)
 
 
 logger = logging.getLogger(__name__)
@@ -46,9 +48,9 @@ class PartyRegistrationHandler:
 
         """
         try:
-            self._validator.validate('Party', request.media)
-            self._registry.register_party(
-                    deserialize(PartyDescription, request.media))
+            self._registry.register_party(validate_and_deserialize(
+                    self._validator, 'Party', PartyDescription,
+                    request.media))
             response.status = HTTP_201
             response.body = 'Created'
         except ValidationError as e:
@@ -101,9 +103,8 @@ class SiteRegistrationHandler:
 
         """
         try:
-            self._validator.validate('Site', request.media)
-            self._registry.register_site(
-                    deserialize(SiteDescription, request.media))
+            self._registry.register_site(validate_and_deserialize(
+                    self._validator, 'Site', SiteDescription, request.media))
             response.status = HTTP_201
             response.body = 'Created'
         except ValidationError as e:
@@ -149,13 +150,11 @@ class RegistryRestApi:
             registry: The registry to serve for.
 
         """
-        self.app = App()
+        self.app = App(middleware=[CompressionMiddleware()])
+        use_fast_json(self.app)
 
         registry_api_file = Path(__file__).parent / 'registry_api.yaml'
-        with open(registry_api_file, 'r') as f:
-            registry_api_def = yaml.safe_load(f.read())
-
-        validator = Validator(registry_api_def)
+        validator = load_validator(registry_api_file)
 
         party_registration = PartyRegistrationHandler(registry, validator)
         self.app.add_route('/parties', party_registration)
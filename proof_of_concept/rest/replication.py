@@ -10,10 +10,17 @@ from retrying import retry
 from proof_of_concept.definitions.interfaces import IReplicationService
 from proof_of_concept.definitions.registry import RegisteredObject
 from proof_of_concept.definitions.policy import Rule
+from proof_of_concept.logs import Summary
 from proof_of_concept.policy.replication import PolicyUpdate
 from proof_of_concept.registry.replication import RegistryUpdate
 from proof_of_concept.replication import ReplicaUpdate
-from proof_of_concept.rest.serialization import serialize, deserialize
+from proof_of_concept.rest import json_codec
+from proof_of_concept.rest.connections import ConnectionPool, default_pool
+from proof_of_concept.rest.msgpack_encoding import (
+        MSGPACK_MEDIA_TYPE, msgpack_available, pack, unpack)
+from proof_of_concept.rest.serialization import (
+        serialize, serialize_binary, validate_and_deserialize,
+        validate_and_deserialize_binary)
 from proof_of_concept.rest.validation import Validator
 
 
@@ -28,6 +35,13 @@ def _retry_on_connection_error(exception: BaseException) -> bool:
     return isinstance(exception, requests.ConnectionError)
 
 
+def update_accept_header() -> Dict[str, str]:
+    """Returns an Accept header for requesting replica updates."""
+    if msgpack_available():
+        return {'Accept': f'{MSGPACK_MEDIA_TYPE}, application/json;q=0.5'}
+    return {'Accept': json_codec.JSON_MEDIA_TYPE}
+
+
 class ReplicationHandler(Generic[T]):
     """A handler for a /updates REST API endpoint."""
     def __init__(self, service: IReplicationService[T]) -> None:
@@ -49,6 +63,14 @@ class ReplicationHandler(Generic[T]):
                 'from_version', required=True)
 
         updates = self._service.get_updates_since(from_version)
+        if msgpack_available():
+            # on a tie, client_prefers() picks the last one
+            media_type = request.client_prefers(
+                    [MSGPACK_MEDIA_TYPE, json_codec.JSON_MEDIA_TYPE])
+            if media_type == MSGPACK_MEDIA_TYPE:
+                response.data = pack(serialize_binary(updates))
+                response.content_type = MSGPACK_MEDIA_TYPE
+                return
         response.media = serialize(updates)
 
 
@@ -56,7 +78,10 @@ class ReplicationRestClient(IReplicationService[T]):
     """Client for a ReplicationHandler REST endpoint."""
     UpdateType = ReplicaUpdate[T]   # type: Type[ReplicaUpdate[T]]
 
-    def __init__(self, endpoint: str, validator: Validator) -> None:
+    def __init__(
+            self, endpoint: str, validator: Validator,
+            connection_pool: Optional[ConnectionPool] = None
+            ) -> None:
         """Create a ReplicationRestClient.
 
         Note that UpdateType must be set to ReplicaUpdate[T] with the
@@ -67,9 +92,14 @@ class ReplicationRestClient(IReplicationService[T]):
         Args:
             endpoint: URL of the endpoint to connect to.
             validator: Validator to use to validate incoming updates.
+            connection_pool: Pool of HTTP connections to use, if not
+                given, a process-wide pool is shared.
         """
         self._endpoint = endpoint
         self._validator = validator
+        if connection_pool is None:
+            connection_pool = default_pool
+        self._connections = connection_pool
 
     def get_updates_since(
             self, from_version: Optional[int]) -> ReplicaUpdate[T]:
@@ -84,11 +114,17 @@ class ReplicationRestClient(IReplicationService[T]):
 
         r = self._retry_http_get(params)
 
-        update_json = r.json()
-        logger.info(f'Replication update: {update_json}')
-        self._validator.validate(self.UpdateType.__name__, update_json)
-        logger.info(f'Validated against {self.UpdateType.__name__}')
-        return deserialize(self.UpdateType, update_json)
+        content_type = r.headers.get('Content-Type', '')
+        if content_type.startswith(MSGPACK_MEDIA_TYPE):
+            update_data = unpack(r.content)
+            return validate_and_deserialize_binary(
+                    self._validator, self.UpdateType, update_data)
+
+        update_json = json_codec.loads(r.content)
+        logger.info('Replication update: %s', Summary(update_json))
+        return validate_and_deserialize(
+                self._validator, self.UpdateType.__name__, self.UpdateType,
+                update_json)
 
     @retry(                                             # type: ignore
             stop_max_delay=20000, wait_fixed=500,
@@ -96,7 +132,8 @@ class ReplicationRestClient(IReplicationService[T]):
     def _retry_http_get(
             self, params: Dict[str, int]) -> requests.Response:
         """Do an HTTP get and retry for a while on failure."""
-        return requests.get(self._endpoint, params=params)
+        return self._connections.get(
+                self._endpoint, params=params, headers=update_accept_header())
 
 
 class PolicyRestClient(ReplicationRestClient[Rule]):
@@ -1,11 +1,13 @@
 """(De)Serialization of objects of various kinds to JSON."""
 import base64
 from typing import (
-        Any, Callable, cast, Dict, Optional, Type, TypeVar, Union)
+        Any, Callable, cast, Dict, List, Optional, Tuple, Type, TypeVar,
+        Union)
 
 from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
 from cryptography.hazmat.primitives.serialization import (
-        Encoding, load_pem_public_key, PublicFormat)
+        Encoding, load_der_public_key, load_pem_public_key, PublicFormat)
 from dateutil import parser as dateparser
 
 from proof_of_concept.definitions.assets import (
@@ -25,6 +27,7 @@ from proof_of_concept.policy.rules import (
 from proof_of_concept.registry.replication import RegistryUpdate
 from proof_of_concept.replication import ReplicaUpdate
 from proof_of_concept.rest.definitions import JSON
+from proof_of_concept.rest.validation import Validator
 
 
 T = TypeVar('T')
@@ -94,75 +97,65 @@ def _deserialize_registered_object(user_input: JSON) -> RegisteredObject:
 
 
 # Rules
+#
+# Rules are serialized as an object with a 'type' tag identifying the
+# kind of rule, a string for each of the rule's fields, and the
+# signature. The tables below map rule classes to their tags and fields
+# and back, and are filled by register_rule_type().
 
 
-def _serialize_in_asset_collection(rule: InAssetCollection) -> JSON:
-    """Serialize an InAssetCollection object to JSON."""
-    return {
-            'type': 'InAssetCollection',
-            'signature': base64.urlsafe_b64encode(rule.signature).decode(),
-            'asset': rule.asset,
-            'collection': rule.collection}
+_rule_tags = dict()     # type: Dict[Type[Rule], Tuple[str, Tuple[str, ...]]]
 
 
-def _serialize_in_party_collection(rule: InPartyCollection) -> JSON:
-    """Serialize an InPartyCollection object to JSON."""
-    return {
-            'type': 'InPartyCollection',
-            'signature': base64.urlsafe_b64encode(rule.signature).decode(),
-            'party': rule.party,
-            'collection': rule.collection}
+_rule_types = dict()    # type: Dict[str, Tuple[Type[Rule], Tuple[str, ...]]]
 
 
-def _serialize_may_access(rule: MayAccess) -> JSON:
-    """Serialize a MayAccess object to JSON."""
-    return {
-            'type': 'MayAccess',
-            'signature': base64.urlsafe_b64encode(rule.signature).decode(),
-            'site': rule.site,
-            'asset': rule.asset}
+def register_rule_type(
+        rule_type: Type[Rule], tag: str, fields: Tuple[str, ...]) -> None:
+    """Registers a kind of rule for (de)serialization.
 
+    Note that to be accepted by the REST API, rules of a new kind also
+    need a corresponding class in the API schemas.
 
-def _serialize_result_of_data_in(rule: ResultOfDataIn) -> JSON:
-    """Serialize a ResultOfDataIn object to JSON."""
-    return {
-            'type': 'ResultOfDataIn',
-            'signature': base64.urlsafe_b64encode(rule.signature).decode(),
-            'data_asset': rule.data_asset,
-            'compute_asset': rule.compute_asset,
-            'collection': rule.collection}
+    Args:
+        rule_type: The class of the rule. Its constructor must take
+            the fields as positional arguments, in the given order.
+        tag: Value of the 'type' field for this kind of rule.
+        fields: Names of the rule's attributes to serialize.
+    """
+    _rule_tags[rule_type] = tag, fields
+    _rule_types[tag] = rule_type, fields
+    _serializers[rule_type] = _serialize_rule
 
 
-def _serialize_result_of_compute_in(rule: ResultOfComputeIn) -> JSON:
-    """Serialize a ResultOfComputeIn object to JSON."""
-    return {
-            'type': 'ResultOfComputeIn',
-            'signature': base64.urlsafe_b64encode(rule.signature).decode(),
-            'data_asset': rule.data_asset,
-            'compute_asset': rule.compute_asset,
-            'collection': rule.collection}
+def _serialize_unsigned_rule(rule: Rule) -> JSON:
+    """Serialize a Rule to JSON, without signature."""
+    tag, fields = _rule_tags[type(rule)]
+    result = {'type': tag}     # type: JSON
+    for field in fields:
+        result[field] = getattr(rule, field)
+    return result
 
 
-def _deserialize_rule(user_input: JSON) -> Rule:
-    """Deserialize a Rule from JSON."""
-    rule = None     # type: Optional[Rule]
-    if user_input['type'] == 'InAssetCollection':
-        rule = InAssetCollection(user_input['asset'], user_input['collection'])
-    elif user_input['type'] == 'InPartyCollection':
-        rule = InPartyCollection(user_input['party'], user_input['collection'])
-    elif user_input['type'] == 'MayAccess':
-        rule = MayAccess(user_input['site'], user_input['asset'])
-    elif user_input['type'] == 'ResultOfDataIn':
-        rule = ResultOfDataIn(
-                user_input['data_asset'], user_input['compute_asset'],
-                user_input['collection'])
-    elif user_input['type'] == 'ResultOfComputeIn':
-        rule = ResultOfComputeIn(
-                user_input['data_asset'], user_input['compute_asset'],
-                user_input['collection'])
-    else:
+def _serialize_rule(rule: Rule) -> JSON:
+    """Serialize a Rule to JSON."""
+    result = _serialize_unsigned_rule(rule)
+    result['signature'] = base64.urlsafe_b64encode(rule.signature).decode()
+    return result
+
+
+def _deserialize_unsigned_rule(user_input: JSON) -> Rule:
+    """Deserialize a Rule from JSON, ignoring its signature."""
+    rule_type_fields = _rule_types.get(user_input['type'])
+    if rule_type_fields is None:
         raise RuntimeError('Invalid rule type when deserialising')
+    rule_type, fields = rule_type_fields
+    return rule_type(*[user_input[field] for field in fields])
 
+
+def _deserialize_rule(user_input: JSON) -> Rule:
+    """Deserialize a Rule from JSON."""
+    rule = _deserialize_unsigned_rule(user_input)
     rule.signature = base64.urlsafe_b64decode(user_input['signature'])
     return rule
 
@@ -242,15 +235,24 @@ def _deserialize_job_submission(user_input: JSON) -> JobSubmission:
 
 
 def _serialize_metadata(metadata: Metadata) -> JSON:
-    """Serialize a Metadata to JSON."""
+    """Serialize a Metadata to JSON.
+
+    The job is referred to by its content hash, rather than included,
+    as it may be large and is usually shared by many assets. Receivers
+    obtain the job separately, see deserialize_metadata().
+    """
     return {
-            'job': _serialize_job(metadata.job),
+            'job_id': metadata.job.content_hash(),
             'item': metadata.item}
 
 
-def _deserialize_metadata(user_input: JSON) -> Metadata:
-    """Deserialize a Metadata from JSON."""
-    job = _deserialize_job(user_input['job'])
+def deserialize_metadata(user_input: JSON, job: Job) -> Metadata:
+    """Deserialize a Metadata from JSON.
+
+    Args:
+        user_input: The serialized metadata.
+        job: The job with the content hash in user_input['job_id'].
+    """
     return Metadata(job, user_input['item'])
 
 
@@ -262,13 +264,21 @@ def _serialize_asset(asset: Asset) -> JSON:
             'metadata': _serialize_metadata(asset.metadata)}
 
 
-def _deserialize_asset(user_input: JSON) -> Asset:
-    """Deserialize an Asset from JSON."""
+def deserialize_asset(user_input: JSON, job: Job) -> Asset:
+    """Deserialize an Asset from JSON.
+
+    Like its metadata, the asset refers to its job by content hash, so
+    the job must be obtained separately and passed in.
+
+    Args:
+        user_input: The serialized asset.
+        job: The job with the content hash in
+            user_input['metadata']['job_id'].
+    """
+    metadata = deserialize_metadata(user_input['metadata'], job)
     if user_input['data'] is None:
-        return ComputeAsset(
-                user_input['id'], user_input['data'], user_input['metadata'])
-    return DataAsset(
-            user_input['id'], user_input['data'], user_input['metadata'])
+        return ComputeAsset(user_input['id'], None, metadata)
+    return DataAsset(user_input['id'], user_input['data'], metadata)
 
 
 def _serialize_compute_asset(asset: ComputeAsset) -> JSON:
@@ -326,11 +336,6 @@ _serializers = dict()   # type: Dict[Type, Callable[[Any], JSON]]
 _serializers = {
         PartyDescription: _serialize_party_description,
         SiteDescription: _serialize_site_description,
-        InAssetCollection: _serialize_in_asset_collection,
-        InPartyCollection: _serialize_in_party_collection,
-        MayAccess: _serialize_may_access,
-        ResultOfDataIn: _serialize_result_of_data_in,
-        ResultOfComputeIn: _serialize_result_of_compute_in,
         WorkflowStep: _serialize_workflow_step,
         Workflow: _serialize_workflow,
         Job: _serialize_job,
@@ -344,6 +349,19 @@ _serializers = {
         }
 
 
+register_rule_type(
+        InAssetCollection, 'InAssetCollection', ('asset', 'collection'))
+register_rule_type(
+        InPartyCollection, 'InPartyCollection', ('party', 'collection'))
+register_rule_type(MayAccess, 'MayAccess', ('site', 'asset'))
+register_rule_type(
+        ResultOfDataIn, 'ResultOfDataIn',
+        ('data_asset', 'compute_asset', 'collection'))
+register_rule_type(
+        ResultOfComputeIn, 'ResultOfComputeIn',
+        ('data_asset', 'compute_asset', 'collection'))
+
+
 def serialize(obj: Serializable) -> JSON:
     """Serialize object to JSON.
 
@@ -366,8 +384,6 @@ _deserialize = {
         Job: _deserialize_job,
         Plan: _deserialize_plan,
         JobSubmission: _deserialize_job_submission,
-        Metadata: _deserialize_metadata,
-        Asset: _deserialize_asset,
         PolicyUpdate: _deserialize_policy_update,
         RegistryUpdate: _deserialize_registry_update,
         }
@@ -381,3 +397,314 @@ def deserialize(typ: Type[T], user_input: JSON) -> T:
         user_input: The user's input as a JSON dictionary.
     """
     return cast(T, _deserialize[typ](user_input))
+
+
+# Binary representations
+#
+# For binary formats such as MessagePack, replica updates are
+# represented as above, except that rule signatures and public keys are
+# raw bytes rather than base64 or PEM text.
+
+
+def _serialize_binary_object(obj: Union[RegisteredObject, Rule]) -> JSON:
+    """Serialize a replicated object to a binary-friendly form."""
+    if isinstance(obj, Rule):
+        result = _serialize_unsigned_rule(obj)
+        result['signature'] = obj.signature
+        return result
+    if isinstance(obj, PartyDescription):
+        return {
+                'id': obj.id,
+                'public_key': obj.public_key.public_bytes(
+                    encoding=Encoding.DER,
+                    format=PublicFormat.SubjectPublicKeyInfo)}
+    return serialize(obj)
+
+
+def _deserialize_binary_object(
+        typ: Type, user_input: JSON) -> Union[RegisteredObject, Rule]:
+    """Deserialize a replicated object from a binary-friendly form."""
+    if typ is Rule:
+        rule = _deserialize_unsigned_rule(user_input)
+        rule.signature = bytes(user_input['signature'])
+        return rule
+    if 'public_key' in user_input:
+        public_key = load_der_public_key(
+                bytes(user_input['public_key']), default_backend())
+        return PartyDescription(
+                user_input['id'], cast(RSAPublicKey, public_key))
+    return _deserialize_site_description(user_input)
+
+
+def serialize_binary(update: IReplicaUpdate) -> JSON:
+    """Serialize a replica update to a binary-friendly form.
+
+    Args:
+        update: A PolicyUpdate or a RegistryUpdate.
+
+    Returns:
+        A representation with signatures and keys as bytes.
+    """
+    result = dict()     # type: JSON
+    result['from_version'] = update.from_version
+    result['to_version'] = update.to_version
+    result['valid_until'] = update.valid_until.isoformat()
+    result['created'] = [_serialize_binary_object(o) for o in update.created]
+    result['deleted'] = [_serialize_binary_object(o) for o in update.deleted]
+    return result
+
+
+def deserialize_binary(
+        typ: Type[AnyReplicaUpdate], user_input: JSON) -> AnyReplicaUpdate:
+    """Deserializes a replica update from a binary-friendly form.
+
+    Args:
+        typ: PolicyUpdate or RegistryUpdate.
+        user_input: Output of serialize_binary(), as received.
+    """
+    return typ(
+            user_input['from_version'],
+            user_input['to_version'],
+            dateparser.isoparse(user_input['valid_until']),
+            {_deserialize_binary_object(typ.ReplicatedType, o)
+                for o in user_input['created']},
+            {_deserialize_binary_object(typ.ReplicatedType, o)
+                for o in user_input['deleted']})
+
+
+# Validating deserialization
+#
+# Untrusted input is normally checked against the API schema first and
+# then deserialized, which takes two passes over it. The decoders below
+# do both in a single pass, but only accept input of exactly the form
+# that we produce ourselves. Anything else goes through the validator
+# and the normal deserializers, so that it is accepted or rejected in
+# the same way as before.
+
+
+class _Mismatch(Exception):
+    """Input is not of the form a decoder expects."""
+    pass
+
+
+def _decode_string(value: Any) -> str:
+    """Checks that a value is a string."""
+    if not isinstance(value, str):
+        raise _Mismatch()
+    return value
+
+
+def _decode_dict(value: Any, size: Optional[int] = None) -> JSON:
+    """Checks that a value is a dict, with a given number of items."""
+    if type(value) is not dict or (size is not None and len(value) != size):
+        raise _Mismatch()
+    return value
+
+
+def _decode_list(value: Any) -> List[Any]:
+    """Checks that a value is a list."""
+    if type(value) is not list:
+        raise _Mismatch()
+    return value
+
+
+def _decode_party_description(
+        user_input: Any, binary: bool) -> PartyDescription:
+    """Decode a PartyDescription from JSON or binary input."""
+    user_input = _decode_dict(user_input, 2)
+    public_key = user_input['public_key']
+    if binary:
+        if type(public_key) is not bytes:
+            raise _Mismatch()
+        key = load_der_public_key(public_key, default_backend())
+    else:
+        key = load_pem_public_key(
+                _decode_string(public_key).encode('ascii'),
+                default_backend())
+    _decode_string(user_input['id'])
+    return PartyDescription(user_input['id'], cast(RSAPublicKey, key))
+
+
+def _decode_site_description(user_input: Any) -> SiteDescription:
+    """Decode a SiteDescription from JSON or binary input."""
+    user_input = _decode_dict(user_input, 7)
+    for name in ('id', 'owner_id', 'admin_id', 'endpoint'):
+        _decode_string(user_input[name])
+    if type(user_input['runner']) is not bool:
+        raise _Mismatch()
+    if type(user_input['store']) is not bool:
+        raise _Mismatch()
+    if user_input['namespace'] is not None:
+        _decode_string(user_input['namespace'])
+    return _deserialize_site_description(user_input)
+
+
+def _decode_registered_object(
+        user_input: Any, binary: bool) -> RegisteredObject:
+    """Decode a RegisteredObject from JSON or binary input."""
+    if 'public_key' in _decode_dict(user_input):
+        return _decode_party_description(user_input, binary)
+    return _decode_site_description(user_input)
+
+
+# Each of these matches exactly one of the rule classes in the API
+# schemas if it has exactly its own fields. Rules of other, registered
+# types are checked by the validator.
+_one_pass_rule_tags = frozenset([
+        'InAssetCollection', 'InPartyCollection', 'MayAccess',
+        'ResultOfDataIn', 'ResultOfComputeIn'])
+
+
+def _decode_rule(user_input: Any, binary: bool) -> Rule:
+    """Decode a Rule from JSON or binary input.
+
+    The rule must have exactly the fields of its type, so that it
+    matches exactly one of the rule schemas.
+    """
+    user_input = _decode_dict(user_input)
+    if user_input['type'] not in _one_pass_rule_tags:
+        raise _Mismatch()
+    rule_type, fields = _rule_types[user_input['type']]
+    if len(user_input) != len(fields) + 2:
+        raise _Mismatch()
+    rule = rule_type(*[_decode_string(user_input[f]) for f in fields])
+    signature = user_input['signature']
+    if binary:
+        if type(signature) is not bytes:
+            raise _Mismatch()
+        rule.signature = signature
+    else:
+        rule.signature = base64.urlsafe_b64decode(_decode_string(signature))
+    return rule
+
+
+def _decode_replica_update(
+        update_type: Type[AnyReplicaUpdate], user_input: Any, binary: bool
+        ) -> AnyReplicaUpdate:
+    """Decode a ReplicaUpdate from JSON or binary input."""
+    user_input = _decode_dict(user_input)
+    from_version = user_input['from_version']
+    to_version = user_input['to_version']
+    if type(from_version) is not int or type(to_version) is not int:
+        raise _Mismatch()
+    valid_until = dateparser.isoparse(
+            _decode_string(user_input['valid_until']))
+
+    decode_object = (
+            _decode_rule if update_type.ReplicatedType is Rule
+            else _decode_registered_object
+            )   # type: Callable[[Any, bool], Any]
+    return update_type(
+            from_version, to_version, valid_until,
+            {decode_object(o, binary)
+                for o in _decode_list(user_input['created'])},
+            {decode_object(o, binary)
+                for o in _decode_list(user_input['deleted'])})
+
+
+def _decode_job_submission(user_input: Any) -> JobSubmission:
+    """Decode a JobSubmission from JSON."""
+    user_input = _decode_dict(user_input)
+    _decode_dict(user_input['job'])
+    _decode_dict(user_input['plan'])
+    return _deserialize_job_submission(user_input)
+
+
+_decoders = {
+        PartyDescription: lambda x: _decode_party_description(x, False),
+        SiteDescription: _decode_site_description,
+        JobSubmission: _decode_job_submission,
+        PolicyUpdate: lambda x: _decode_replica_update(PolicyUpdate, x, False),
+        RegistryUpdate: lambda x: _decode_replica_update(
+            RegistryUpdate, x, False),
+        }   # type: Dict[Type, Callable[[Any], Any]]
+
+
+def validate_and_deserialize(
+        validator: Validator, class_: str, typ: Type[T], user_input: Any
+        ) -> T:
+    """Validates and deserializes an object from user input.
+
+    This gives the same result as validating the input against the
+    given schema class and then deserializing it, but takes a single
+    pass over the input if it is in the usual form.
+
+    Args:
+        validator: The validator for the API the input came in on.
+        class_: The name of the class in the schema to check against.
+        typ: The type of object to deserialize.
+        user_input: The user's input as a JSON dictionary.
+
+    Raises:
+        ValidationError: If the input was invalid.
+    """
+    decoder = _decoders.get(typ)
+    if decoder is not None:
+        try:
+            return cast(T, decoder(user_input))
+        except (_Mismatch, KeyError, TypeError, ValueError, AttributeError):
+            # Unusual or invalid, have the validator check it properly
+            pass
+    validator.validate(class_, user_input)
+    return deserialize(typ, user_input)
+
+
+def _binary_object_as_text(user_input: Any) -> Any:
+    """Returns a binary-form replicated object with text for its bytes.
+
+    Signatures and public keys are replaced by their base64 encoding,
+    or by None if they are not bytes, so that the validator rejects
+    them. Other fields are left alone.
+    """
+    if type(user_input) is not dict:
+        return user_input
+    result = dict(user_input)
+    for name in ('signature', 'public_key'):
+        if name in result:
+            value = result[name]
+            result[name] = (
+                    base64.urlsafe_b64encode(value).decode('ascii')
+                    if type(value) is bytes else None)
+    return result
+
+
+def _binary_update_as_text(user_input: Any) -> Any:
+    """Returns a binary-form replica update with text for its bytes.
+
+    The API schemas have strings for signatures and public keys, and
+    only those may be bytes in the binary form. Converting just them
+    lets the rest of the input be validated as usual, so that bytes
+    anywhere else are rejected.
+    """
+    if type(user_input) is not dict:
+        return user_input
+    result = dict(user_input)
+    for name in ('created', 'deleted'):
+        if type(result.get(name)) is list:
+            result[name] = [_binary_object_as_text(o) for o in result[name]]
+    return result
+
+
+def validate_and_deserialize_binary(
+        validator: Validator, typ: Type[AnyReplicaUpdate], user_input: Any
+        ) -> AnyReplicaUpdate:
+    """Validates and deserializes a replica update in binary form.
+
+    This is the counterpart of validate_and_deserialize() for the
+    output of serialize_binary().
+
+    Args:
+        validator: The validator for the API the input came in on.
+        typ: PolicyUpdate or RegistryUpdate.
+        user_input: The update as received.
+
+    Raises:
+        ValidationError: If the input was invalid.
+    """
+    try:
+        return _decode_replica_update(typ, user_input, True)
+    except (_Mismatch, KeyError, TypeError, ValueError, AttributeError):
+        # Unusual or invalid, have the validator check it properly
+        pass
+    validator.validate(typ.__name__, _binary_update_as_text(user_input))
+    return deserialize_binary(typ, user_input)
@@ -1,30 +1,202 @@
-"""Tools for validating untrusted JSON against an OpenAPI schema."""
-from typing import Dict
+"""Tools for validating untrusted JSON against an OpenAPI schema.
 
-import jsonschema
-from jsonschema.validators import RefResolver
-from openapi_schema_validator import OAS30Validator
+Valid input is checked by functions compiled from the schema, and the
+generic validator from openapi_schema_validator is only needed to find
+out what is wrong with invalid input. Importing it and jsonschema takes
+longer than importing the rest of the package, so they are imported
+only when they are first needed.
+"""
+from pathlib import Path
+from threading import local, Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import ruamel.yaml as yaml
 
 from proof_of_concept.rest.definitions import JSON
 
+if TYPE_CHECKING:
+    from openapi_schema_validator import OAS30Validator
+
+
+class ValidationError(Exception):
+    """Raised if input does not match the schema.
+
+    The message is that of the original jsonschema.ValidationError,
+    including where in the input and the schema the problem is. The
+    original exception is available as the __cause__ of this one.
+    """
+    pass
+
+
+_Check = Callable[[Any], bool]
+
+
+_type_checks = {
+        'string': lambda x: isinstance(x, str),
+        'integer': lambda x: type(x) is int,
+        'number': lambda x: type(x) is int or type(x) is float,
+        'boolean': lambda x: type(x) is bool,
+        'object': lambda x: isinstance(x, dict),
+        'array': lambda x: isinstance(x, list),
+        }   # type: Dict[str, _Check]
+
+
+# Keywords the validator knows about, i.e. the keys of
+# OAS30Validator.VALIDATORS, listed here so that we don't need to
+# import it. Other keys in a schema are ignored by the validator, and
+# therefore also by the compiled checks.
+_validator_keywords = {
+        '$ref', 'additionalProperties', 'allOf', 'anyOf', 'deprecated',
+        'discriminator', 'enum', 'example', 'externalDocs', 'format', 'items',
+        'maxItems', 'maxLength', 'maxProperties', 'maximum', 'minItems',
+        'minLength', 'minProperties', 'minimum', 'multipleOf', 'not', 'oneOf',
+        'pattern', 'properties', 'readOnly', 'required', 'type',
+        'uniqueItems', 'writeOnly', 'xml'}
+
+
+# Keywords the validator knows about, but which never reject anything
+# here, as we do not check formats.
+_no_op_keywords = {
+        'format', 'readOnly', 'writeOnly', 'example', 'xml', 'externalDocs',
+        'deprecated'}
+
+
+_compiled_keywords = {
+        'type', 'nullable', 'required', 'properties', 'additionalProperties',
+        'items', 'oneOf', 'anyOf', '$ref'}
+
+
+def _compile(schema: JSON, schemas: JSON) -> Optional[_Check]:
+    """Compiles a schema into a fast check function.
+
+    The check is a plain Python function that returns True if the input
+    is valid. It may be stricter than the real validator, but is never
+    more lenient, so that a False result can be followed up with a full
+    validation to get a proper error.
+
+    Args:
+        schema: The schema to compile.
+        schemas: The schemas in the components section of the API,
+            for resolving references.
+
+    Returns:
+        The check function, or None if the schema uses features that
+        are not supported here.
+    """
+    keywords = set(schema) & _validator_keywords
+    if keywords - _compiled_keywords - _no_op_keywords:
+        return None
+
+    if '$ref' in schema:
+        ref = schema['$ref']
+        if not ref.startswith('#/components/schemas/') or (
+                keywords - _no_op_keywords != {'$ref'}):
+            return None
+        ref_schema = schemas.get(ref[len('#/components/schemas/'):])
+        if ref_schema is None:
+            return None
+        return _compile(ref_schema, schemas)
+
+    checks = list()     # type: List[_Check]
+
+    if 'type' in schema:
+        type_check = _type_checks.get(schema['type'])
+        if type_check is None:
+            return None
+        if schema.get('nullable') is True:
+            checks.append(lambda x: x is None or type_check(x))
+        else:
+            checks.append(type_check)
 
-ValidationError = jsonschema.ValidationError
+    if 'required' in schema:
+        required = tuple(schema['required'])
+        checks.append(lambda x: not isinstance(x, dict) or all(
+            name in x for name in required))
+
+    properties = dict()     # type: Dict[str, _Check]
+    for name, prop_schema in schema.get('properties', {}).items():
+        prop_check = _compile(prop_schema, schemas)
+        if prop_check is None:
+            return None
+        properties[name] = prop_check
+
+    if properties:
+        checks.append(lambda x: not isinstance(x, dict) or all(
+            check(x[name]) for name, check in properties.items()
+            if name in x))
+
+    if 'additionalProperties' in schema:
+        add_props = schema['additionalProperties']
+        if add_props is True:
+            pass
+        elif add_props is False:
+            checks.append(lambda x: not isinstance(x, dict) or all(
+                name in properties for name in x))
+        else:
+            add_check = _compile(add_props, schemas)
+            if add_check is None:
+                return None
+            checks.append(lambda x: not isinstance(x, dict) or all(
+                add_check(value) for name, value in x.items()
+                if name not in properties))
+
+    if 'items' in schema:
+        item_check = _compile(schema['items'], schemas)
+        if item_check is None:
+            return None
+        checks.append(lambda x: not isinstance(x, list) or all(
+            map(item_check, x)))
+
+    if 'oneOf' in schema:
+        one_of = _compile_all(schema['oneOf'], schemas)
+        if one_of is None:
+            return None
+        checks.append(lambda x: sum(1 for check in one_of if check(x)) == 1)
+
+    if 'anyOf' in schema:
+        any_of = _compile_all(schema['anyOf'], schemas)
+        if any_of is None:
+            return None
+        checks.append(lambda x: any(check(x) for check in any_of))
+
+    return lambda x: all(check(x) for check in checks)
+
+
+def _compile_all(
+        schemas_to_compile: List[JSON], schemas: JSON
+        ) -> Optional[List[_Check]]:
+    """Compiles a list of schemas, or returns None if any fails."""
+    checks = list()     # type: List[_Check]
+    for schema in schemas_to_compile:
+        check = _compile(schema, schemas)
+        if check is None:
+            return None
+        checks.append(check)
+    return checks
 
 
 class Validator:
-    """Validates untrusted JSON against a schema."""
+    """Validates untrusted JSON against a schema.
+
+    Validators for the individual classes in the schema are created
+    when they are first used. The reference resolver they use keeps
+    track of the current scope and is not thread-safe, so each thread
+    gets its own.
+
+    Where possible, input is first checked using a function compiled
+    from the schema, which is much faster than the generic validator.
+    The generic validator is only used if that is not possible or the
+    input fails the check, so errors are the same either way.
+    """
     def __init__(self, schema: JSON) -> None:
         """Create a Validator.
 
         Args:
             schema: An OpenAPI schema to check against.
         """
-        ref_resolver = RefResolver.from_schema(schema)
-        self._validator = dict()   # type: Dict[str, OAS30Validator]
-        for schema_type in schema['components']['schemas']:
-            self._validator[schema_type] = OAS30Validator(
-                    schema['components']['schemas'][schema_type],
-                    resolver=ref_resolver)
+        self._schema = schema
+        self._local = local()
+        self._checks = dict()   # type: Dict[str, Optional[_Check]]
 
     def validate(self, class_: str, user_input: JSON) -> None:
         """Validates untrusted JSON against a schema class definition.
@@ -38,4 +210,60 @@ class Validator:
             KeyError: If the class is not available for validation.
             ValidationError: If the input was invalid.
         """
-        self._validator[class_].validate(user_input)
+        schemas = self._schema['components']['schemas']
+        if class_ not in self._checks:
+            self._checks[class_] = _compile(schemas[class_], schemas)
+        check = self._checks[class_]
+        if check is not None and check(user_input):
+            return
+
+        import jsonschema
+        from openapi_schema_validator import OAS30Validator
+
+        validators = getattr(
+                self._local, 'validators', None
+                )   # type: Optional[Dict[str, OAS30Validator]]
+        if validators is None:
+            validators = dict()
+            self._local.validators = validators
+            self._local.resolver = jsonschema.RefResolver.from_schema(
+                    self._schema)
+
+        validator = validators.get(class_)
+        if validator is None:
+            validator = OAS30Validator(
+                    schemas[class_], resolver=self._local.resolver)
+            validators[class_] = validator
+        try:
+            validator.validate(user_input)
+        except jsonschema.ValidationError as e:
+            raise ValidationError(str(e)) from e
+
+
+_validators = dict()    # type: Dict[Path, Tuple[float, Validator]]
+
+_validators_lock = Lock()
+
+
+def load_validator(api_file: Path) -> Validator:
+    """Returns a Validator for an OpenAPI specification file.
+
+    Validators are cached and shared within the process, so that the
+    file is parsed only once, or again if it has been modified.
+
+    Args:
+        api_file: Path to a YAML file with the API specification.
+
+    Returns:
+        A Validator for the schemas in the specification.
+    """
+    api_file = api_file.resolve()
+    mtime = api_file.stat().st_mtime
+    with _validators_lock:
+        cached = _validators.get(api_file)
+        if cached is None or cached[0] != mtime:
+            with open(api_file, 'r') as f:
+                api_def = yaml.safe_load(f.read())
+            cached = mtime, Validator(api_def)
+            _validators[api_file] = cached
+        return cached[1]
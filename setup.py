@@ -65,5 +65,10 @@ setup(
     ],
     extras_require={
         'dev':  ['prospector[with_pyroma]', 'yapf', 'isort'],
+        'asgi': ['a2wsgi', 'uvicorn'],
+        'async': ['httpx'],
+        'msgpack': ['msgpack'],
+        'orjson': ['orjson'],
+        'zstd': ['zstandard'],
     }
 )
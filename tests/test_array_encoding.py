@@ -0,0 +1,43 @@
+import pytest
+
+from proof_of_concept.rest.array_encoding import (
+        array_layout, array_media_type, decode_array, encode_array)
+
+
+def roundtrip(data):
+    dtype, shape = array_layout(data)
+    encoded = b''.join(encode_array(data, dtype, 16))
+    return decode_array(array_media_type(dtype, shape), encoded)
+
+
+def test_array_layout():
+    assert array_layout(3) == ('int64', 'scalar')
+    assert array_layout(12.5) == ('float64', 'scalar')
+    assert array_layout([1, 2, 3]) == ('int64', 'list')
+    assert array_layout([1.0, 2.5]) == ('float64', 'list')
+    assert array_layout([1, 2.5]) is None
+    assert array_layout([2**60, 0.5]) is None
+    assert array_layout([]) == ('int64', 'list')
+    assert array_layout(None) is None
+    assert array_layout(True) is None
+    assert array_layout([[1, 2], [3]]) is None
+    assert array_layout([2**64]) is None
+
+
+def test_array_roundtrip():
+    assert roundtrip(42) == 42
+    assert roundtrip(12.5) == 12.5
+    assert roundtrip(list(range(-10, 10))) == list(range(-10, 10))
+    assert roundtrip([0.1, 1e300, -3.0]) == [0.1, 1e300, -3.0]
+    assert roundtrip([]) == []
+
+
+def test_array_invalid():
+    with pytest.raises(ValueError):
+        decode_array('application/json', b'')
+    with pytest.raises(ValueError):
+        decode_array(array_media_type('int32', 'list'), b'')
+    with pytest.raises(ValueError):
+        decode_array(array_media_type('int64', 'list'), b'1234567')
+    with pytest.raises(ValueError):
+        decode_array(array_media_type('int64', 'scalar'), b'')
@@ -0,0 +1,24 @@
+import pytest
+
+from proof_of_concept.registry.registry import Registry
+from proof_of_concept.rest.connections import ConnectionPool
+from proof_of_concept.rest.registry import RegistryRestApi
+
+asgi = pytest.importorskip('proof_of_concept.rest.asgi')
+
+
+def test_asgi_server_keep_alive():
+    server = asgi.AsgiServer(RegistryRestApi(Registry()).app)
+    try:
+        pool = ConnectionPool()
+        for _ in range(3):
+            r = pool.get(
+                    f'{server.endpoint}/updates', params={'from_version': 0})
+            assert r.ok
+            assert r.json()['to_version'] == 0
+
+        stats = list(pool.stats().values())[0]
+        assert stats.requests == 3
+        assert stats.connections == 1
+    finally:
+        server.close()
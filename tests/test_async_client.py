@@ -0,0 +1,44 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+import ruamel.yaml as yaml
+
+from proof_of_concept.definitions.registry import PartyDescription
+from proof_of_concept.rest.validation import Validator
+
+async_client = pytest.importorskip('proof_of_concept.rest.async_client')
+
+
+def test_async_registry_clients(registry_server, private_key):
+    registry_api_file = (
+            Path(__file__).parents[1] / 'proof_of_concept' / 'rest' /
+            'registry_api.yaml')
+    with open(registry_api_file, 'r') as f:
+        validator = Validator(yaml.safe_load(f.read()))
+
+    async def run():
+        async with async_client.create_http_client() as http_client:
+            registry_client = async_client.AsyncRegistryClient(
+                    http_client=http_client)
+            replication_client = async_client.AsyncRegistryRestClient(
+                    'http://localhost:4413/updates', validator, http_client)
+
+            await registry_client.register_party(PartyDescription(
+                    'party:ns:party1', private_key.public_key()))
+            await registry_client.register_party(PartyDescription(
+                    'party:ns:party2', private_key.public_key()))
+
+            updates = await asyncio.gather(*[
+                    replication_client.get_updates_since(0)
+                    for _ in range(5)])
+            for update in updates:
+                assert {o.id for o in update.created} == {
+                        'party:ns:party1', 'party:ns:party2'}
+
+            await registry_client.deregister_party('party:ns:party1')
+            await registry_client.deregister_party('party:ns:party2')
+            with pytest.raises(KeyError):
+                await registry_client.deregister_party('party:ns:party1')
+
+    asyncio.run(run())
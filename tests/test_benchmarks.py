@@ -0,0 +1,16 @@
+from benchmarks.policy import _Sites, SyntheticPolicy
+from proof_of_concept.components.orchestration import WorkflowPlanner
+from proof_of_concept.policy.evaluation import PolicyEvaluator
+
+
+def test_synthetic_policy():
+    policy = SyntheticPolicy(5, 4, 3, 2)
+    assert len(policy.sites) == 5
+
+    evaluator = PolicyEvaluator(policy)
+    planner = WorkflowPlanner(_Sites(policy.sites), evaluator)
+    plans = planner.make_plans(policy.site(0), policy.job(2))
+
+    # each processing step can run at the data owner or one of the two
+    # sites it shares with, and anyone can combine the public results
+    assert len(plans) == 3 * 3 * 5
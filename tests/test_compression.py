@@ -0,0 +1,59 @@
+import gzip
+
+from falcon import App
+from falcon import testing
+
+from proof_of_concept.rest.compression import (
+        accept_encoding, CompressionMiddleware)
+
+
+class Resource:
+    def on_get(self, request, response):
+        response.media = {'items': list(range(int(request.params['n'])))}
+
+    def on_get_stream(self, request, response):
+        response.stream = iter([b'[1, 2', b', 3]'])
+
+
+def client():
+    app = App(middleware=[CompressionMiddleware(min_size=100)])
+    app.add_route('/test', Resource())
+    app.add_route('/stream', Resource(), suffix='stream')
+    return testing.TestClient(app)
+
+
+def test_compress_large_response():
+    result = client().simulate_get(
+            '/test', params={'n': 1000},
+            headers={'Accept-Encoding': 'gzip, deflate'})
+    assert result.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(result.content).startswith(b'{"items": [0, 1,')
+
+
+def test_no_compression():
+    result = client().simulate_get(
+            '/test', params={'n': 3},
+            headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in result.headers
+    assert result.json == {'items': [0, 1, 2]}
+
+    result = client().simulate_get('/test', params={'n': 1000})
+    assert 'Content-Encoding' not in result.headers
+
+    result = client().simulate_get(
+            '/test', params={'n': 1000},
+            headers={'Accept-Encoding': 'gzip;q=0, identity'})
+    assert 'Content-Encoding' not in result.headers
+
+
+def test_compress_stream():
+    result = client().simulate_get(
+            '/stream', headers={'Accept-Encoding': '*'})
+    assert result.headers['Content-Encoding'] in ('gzip', 'zstd')
+    if result.headers['Content-Encoding'] == 'gzip':
+        assert gzip.decompress(result.content) == b'[1, 2, 3]'
+
+
+def test_accept_encoding():
+    assert accept_encoding(False) == 'gzip'
+    assert accept_encoding(True) == 'zstd, gzip'
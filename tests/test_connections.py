@@ -0,0 +1,77 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+from urllib3.util.request import ACCEPT_ENCODING
+
+from proof_of_concept.rest.connections import ConnectionPool
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def keep_alive_server():
+    server = ThreadingHTTPServer(('localhost', 0), KeepAliveHandler)
+    server.daemon_threads = True
+    thread = Thread(target=server.serve_forever)
+    thread.start()
+
+    yield f'http://localhost:{server.server_port}'
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_connection_pool(keep_alive_server):
+    pool = ConnectionPool(pool_size=2)
+    pool.set_pool_size(keep_alive_server, 4)
+
+    def fetch():
+        r = pool.get(f'{keep_alive_server}/updates')
+        assert r.ok
+
+    fetch()
+    fetch()
+    # other threads have their own session, but share the connections
+    thread = Thread(target=fetch)
+    thread.start()
+    thread.join()
+
+    stats = list(pool.stats().values())[0]
+    assert stats.requests == 3
+    assert stats.connections == 1
+    assert stats.reused == 2
+
+
+def test_connection_pool_closing_server(registry_server):
+    # the wsgiref servers close the connection after each response
+    pool = ConnectionPool()
+    for _ in range(2):
+        r = pool.get(
+                'http://localhost:4413/updates', params={'from_version': 0})
+        assert r.ok
+
+    stats = pool.stats()['localhost:4413']
+    assert stats.requests == 2
+    assert stats.connections == 2
+
+
+def test_accept_encoding():
+    # only ask for zstd if urllib3 can decode it
+    header = ConnectionPool().session().headers['Accept-Encoding']
+    assert ('zstd' in header) == ('zstd' in ACCEPT_ENCODING)
+    assert 'gzip' in header
@@ -0,0 +1,38 @@
+import pytest
+
+from proof_of_concept.definitions.identifier import Identifier
+
+
+def test_identifier_interning():
+    i1 = Identifier('asset:ns:name:site_ns:site')
+    i2 = Identifier('asset:ns:name:site_ns:site')
+    assert i1 is i2
+    assert Identifier(i1) is i1
+    assert Identifier.trusted('asset:ns:name:site_ns:site') is i1
+    assert i1.location() is Identifier('site:site_ns:site')
+    assert Identifier.from_id_hash('abc') is Identifier('result:abc')
+
+    with pytest.raises(ValueError):
+        Identifier('asset:ns:name')
+    with pytest.raises(ValueError):
+        Identifier('assets:ns:name:site_ns:site')
+
+
+def test_identifier_segments():
+    asset = Identifier('asset:ns:name:site_ns:site')
+    assert asset.segments == ('asset', 'ns', 'name', 'site_ns', 'site')
+    assert asset.kind == 'asset'
+    assert asset.namespace() == 'ns'
+    assert asset.name() == 'name'
+    assert asset.location() == 'site:site_ns:site'
+    assert asset.location() is asset.location()
+    assert asset.location().kind == 'site'
+
+    result = Identifier.from_id_hash('abc')
+    assert result.kind == 'result'
+    with pytest.raises(RuntimeError):
+        result.namespace()
+    with pytest.raises(RuntimeError):
+        result.location()
+
+    assert Identifier('*').kind == '*'
@@ -0,0 +1,32 @@
+from unittest.mock import patch
+
+from falcon import App, testing
+
+from proof_of_concept.rest import json_codec
+
+
+class Echo:
+    def on_post(self, request, response):
+        response.media = request.media
+
+
+def test_json_codec():
+    obj = {'a': [1, 2.5, None, True, 'xé'], 'b': {'c': 2**70}}
+    assert json_codec.loads(json_codec.dumps(obj)) == obj
+    assert json_codec.loads(json_codec.dumps(obj).decode()) == obj
+    with patch.object(json_codec, 'orjson', None):
+        assert json_codec.loads(json_codec.dumps(obj)) == obj
+
+
+def test_fast_json_media():
+    app = App()
+    json_codec.use_fast_json(app)
+    app.add_route('/echo', Echo())
+    client = testing.TestClient(app)
+
+    result = client.simulate_post('/echo', json={'a': [1, 2]})
+    assert result.json == {'a': [1, 2]}
+
+    result = client.simulate_post(
+            '/echo', body='{"a": ', content_type='application/json')
+    assert result.status_code == 400
@@ -0,0 +1,47 @@
+import logging
+
+import pytest
+
+from proof_of_concept.logs import set_log_levels, summarize, Summary
+
+
+def test_summarize_short():
+    obj = {'a': [1, 2.5, None, True], 'b': ('x', b'y'), 'c': {}}
+    assert summarize(obj) == repr(obj)
+
+
+def test_summarize_long():
+    obj = {'rules': [{'type': 'MayAccess', 'asset': 'x' * 100}] * 10000}
+    result = summarize(obj, 50)
+    assert result == repr(obj)[:50] + '...' + ' (1 items)'
+
+    result = summarize('y' * 1000000, 10)
+    assert result == "'yyyyyyyyy..."
+
+
+class Unprintable:
+    def __repr__(self):
+        raise AssertionError('Formatted a disabled message')
+
+
+def test_summary_deferred(caplog):
+    logger = logging.getLogger('proof_of_concept.test_logs')
+    logger.setLevel(logging.WARNING)
+    logger.info('Object: %s', Summary(Unprintable()))
+
+    logger.warning('Object: %s', Summary(list(range(1000)), 10))
+    assert caplog.records[-1].getMessage() == (
+            'Object: [0, 1, 2, ... (1000 items)')
+
+
+def test_set_log_levels():
+    set_log_levels({
+        'proof_of_concept.test_logs.a': 'debug',
+        'proof_of_concept.test_logs.b': 'ERROR'})
+    assert logging.getLogger('proof_of_concept.test_logs.a').level == (
+            logging.DEBUG)
+    assert logging.getLogger('proof_of_concept.test_logs.b').level == (
+            logging.ERROR)
+
+    with pytest.raises(ValueError):
+        set_log_levels({'proof_of_concept.test_logs.c': 'LOUD'})
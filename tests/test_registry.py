@@ -0,0 +1,66 @@
+import pytest
+
+from proof_of_concept.definitions.registry import (
+        PartyDescription, SiteDescription)
+from proof_of_concept.registry.registry import Registry
+
+
+def test_registry_duplicates_and_owners(private_key):
+    registry = Registry()
+    party = PartyDescription('party:ns1:party1', private_key.public_key())
+    registry.register_party(party)
+    with pytest.raises(RuntimeError):
+        registry.register_party(party)
+
+    site = SiteDescription(
+            'site:ns1:site1', 'party:ns1:party1', 'party:ns1:party1',
+            'http://site1.example.com', True, True, 'ns1')
+    registry.register_site(site)
+    with pytest.raises(RuntimeError):
+        registry.register_site(site)
+
+    with pytest.raises(RuntimeError):
+        registry.register_site(SiteDescription(
+                'site:ns1:site2', 'party:ns1:party2', 'party:ns1:party1',
+                'http://site2.example.com', True, True, None))
+
+    registry.deregister_site('site:ns1:site1')
+    with pytest.raises(KeyError):
+        registry.deregister_site('site:ns1:site1')
+
+    registry.register_party(PartyDescription(
+            'party:ns1:party2', private_key.public_key()))
+    registry.deregister_party('party:ns1:party2')
+    with pytest.raises(RuntimeError):
+        registry.register_site(SiteDescription(
+                'site:ns1:site2', 'party:ns1:party2', 'party:ns1:party1',
+                'http://site2.example.com', True, True, None))
+
+    registry.register_site(SiteDescription(
+            'site:ns1:site1', 'party:ns1:party1', 'party:ns1:party1',
+            'http://site1.example.com', True, True, 'ns1'))
+    registry.deregister_site('site:ns1:site1')
+    registry.deregister_party('party:ns1:party1')
+    with pytest.raises(RuntimeError):
+        registry.register_site(site)
+    assert registry.store.objects() == set()
+
+
+def test_description_equality(private_key):
+    public_key = private_key.public_key()
+    party1 = PartyDescription('party:ns1:party1', public_key)
+    assert party1 == PartyDescription('party:ns1:party1', public_key)
+    assert party1 != PartyDescription('party:ns1:party2', public_key)
+
+    site1 = SiteDescription(
+            'site:ns1:site1', 'party:ns1:party1', 'party:ns1:party1',
+            'http://site1.example.com', True, True, 'ns1')
+    site2 = SiteDescription(
+            'site:ns1:site1', 'party:ns1:party1', 'party:ns1:party1',
+            'http://site1.example.com', True, True, 'ns1')
+    site3 = SiteDescription(
+            'site:ns1:site1', 'party:ns1:party1', 'party:ns1:party1',
+            'http://site3.example.com', True, True, 'ns1')
+    assert site1 == site2
+    assert {site1, site2, site3} == {site1, site3}
+    assert not hasattr(site1, '__dict__')
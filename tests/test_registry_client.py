@@ -0,0 +1,32 @@
+import pytest
+
+from proof_of_concept.components.registry_client import RegistryClient
+from proof_of_concept.definitions.registry import (
+        PartyDescription, SiteDescription)
+
+
+def test_registry_client_lookups(registry_server, private_key):
+    client = RegistryClient()
+    client.register_party(PartyDescription(
+            'party:ns1:party1', private_key.public_key()))
+    client.register_site(SiteDescription(
+            'site:ns1:site1', 'party:ns1:party1', 'party:ns1:party1',
+            'http://site1.example.com', True, True, 'ns1'))
+    client.register_site(SiteDescription(
+            'site:ns1:site2', 'party:ns1:party1', 'party:ns1:party1',
+            'http://site2.example.com', False, True, None))
+
+    assert client.list_sites_with_runners() == ['site:ns1:site1']
+    assert client.get_site_by_id('site:ns1:site2').endpoint == (
+            'http://site2.example.com')
+    assert client.get_public_key_for_ns('ns1') is not None
+
+    client.deregister_site('site:ns1:site1')
+    client.deregister_site('site:ns1:site2')
+    client.deregister_party('party:ns1:party1')
+
+    assert client.list_sites_with_runners() == []
+    with pytest.raises(KeyError):
+        client.get_site_by_id('site:ns1:site2')
+    with pytest.raises(RuntimeError):
+        client.get_public_key_for_ns('ns1')
@@ -2,8 +2,14 @@ from datetime import datetime, timedelta
 from unittest.mock import MagicMock
 import time
 
+import pytest
+
+from proof_of_concept.policy.definitions import PolicyUpdate
+from proof_of_concept.policy.replication import PolicyStore
+from proof_of_concept.policy.rules import MayAccess
 from proof_of_concept.replication import (
         CanonicalStore, Replica, Replicable, ReplicableArchive, ReplicaUpdate)
+from proof_of_concept.rest.serialization import deserialize, serialize
 
 
 class A:
@@ -82,4 +88,79 @@ def test_validation():
     assert not replica.is_valid()
 
 
+def test_invalidate():
+    a1 = A('a1')
+
+    store = MagicMock()
+    store.get_updates_since.return_value = ReplicaUpdate(
+            0, 1, datetime.now() + timedelta(seconds=10.0), {a1}, set())
+    replica = Replica(store)
+    replica.update()
+    assert replica.is_valid()
+
+    replica.invalidate()
+    assert not replica.is_valid()
+    store.get_updates_since.return_value = ReplicaUpdate(
+            1, 1, datetime.now() + timedelta(seconds=10.0), set(), set())
+    replica.update()
+    store.get_updates_since.assert_called_with(1)
+    assert replica.objects == {a1}
+
+
+def test_canonical_store_objects():
+    archive = ReplicableArchive()
+    store = CanonicalStore(archive, 0.01)
+    assert store.objects() == set()
+
+    a1 = A('a1')
+    store.insert(a1)
+    store.insert(a1)
+    objects = store.objects()
+    assert objects == {a1}
+    assert archive.version == 1
+
+    store.delete(a1)
+    assert store.objects() == set()
+    # a snapshot, so not affected by later changes
+    assert objects == {a1}
+    store.insert(a1)
+    assert store.objects() == {a1}
+    store.delete(a1)
+    assert store.objects() == set()
+    assert all(rec.deleted is not None for rec in archive.records)
+
+    with pytest.raises(ValueError):
+        store.delete(a1)
+
+    a2 = A('a2')
+    store.insert(a2)
+    assert CanonicalStore(archive, 0.01).objects() == {a2}
+
+
+def test_replicate_rules(private_key):
+    store = PolicyStore(ReplicableArchive(), 0.0)
+
+    def roundtrip(from_version):
+        update = store.get_updates_since(from_version)
+        return deserialize(PolicyUpdate, serialize(update))
+
+    source = MagicMock()
+    source.get_updates_since.side_effect = roundtrip
+    replica = Replica(source)
+
+    rules = [
+            MayAccess('site:ns:site1', 'asset:ns:asset1:ns:site1'),
+            MayAccess('site:ns:site2', 'asset:ns:asset1:ns:site1')]
+    for rule in rules:
+        rule.sign(private_key)
+        store.insert(rule)
+
+    replica.update()
+    assert replica.objects == set(rules)
+
+    store.delete(rules[0])
+    replica.update()
+    assert replica.objects == {rules[1]}
+
+
 # This could do with some unit testing of store, server and replica
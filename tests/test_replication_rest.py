@@ -0,0 +1,83 @@
+from datetime import datetime
+from pathlib import Path
+
+from falcon import App, testing
+import pytest
+import ruamel.yaml as yaml
+
+from proof_of_concept.definitions.registry import (
+        PartyDescription, SiteDescription)
+from proof_of_concept.policy.definitions import PolicyUpdate
+from proof_of_concept.policy.rules import InAssetCollection, MayAccess
+from proof_of_concept.registry.replication import RegistryUpdate
+from proof_of_concept.rest import json_codec
+from proof_of_concept.rest.msgpack_encoding import (
+        MSGPACK_MEDIA_TYPE, pack, unpack)
+from proof_of_concept.rest.replication import (
+        ReplicationHandler, update_accept_header)
+from proof_of_concept.rest.serialization import (
+        deserialize, serialize_binary, validate_and_deserialize_binary)
+from proof_of_concept.rest.validation import Validator
+
+
+pytest.importorskip('msgpack')
+
+
+def _validator(api_file):
+    path = Path(__file__).parents[1] / 'proof_of_concept' / 'rest' / api_file
+    with open(path, 'r') as f:
+        return Validator(yaml.safe_load(f.read()))
+
+
+class UpdateService:
+    def __init__(self, update):
+        self.update = update
+
+    def get_updates_since(self, from_version):
+        return self.update
+
+
+def test_policy_update_negotiation(private_key):
+    rules = {
+            MayAccess('site:ns:site1', 'asset:ns:asset1:ns:site1'),
+            InAssetCollection(
+                'asset:ns:asset1:ns:site1', 'asset_collection:ns:coll1')}
+    for rule in rules:
+        rule.sign(private_key)
+    update = PolicyUpdate(0, 2, datetime.now(), rules, set())
+
+    app = App()
+    app.add_route('/updates', ReplicationHandler(UpdateService(update)))
+    client = testing.TestClient(app)
+
+    result = client.simulate_get(
+            '/updates', params={'from_version': 0},
+            headers=update_accept_header())
+    assert result.headers['Content-Type'] == MSGPACK_MEDIA_TYPE
+    update_data = unpack(result.content)
+    received = validate_and_deserialize_binary(
+            _validator('site_api.yaml'), PolicyUpdate, update_data)
+    assert received.created == rules
+    for rule in received.created:
+        assert rule.has_valid_signature(private_key.public_key())
+
+    json_result = client.simulate_get(
+            '/updates', params={'from_version': 0})
+    assert json_result.headers['Content-Type'].startswith('application/json')
+    assert len(result.content) < len(json_result.content)
+    assert deserialize(
+            PolicyUpdate, json_codec.loads(json_result.content)
+            ).created == rules
+
+
+def test_registry_update_binary(private_key):
+    party = PartyDescription('party:ns:party1', private_key.public_key())
+    site = SiteDescription(
+            'site:ns:site1', 'party:ns:party1', 'party:ns:party1',
+            'http://site1.example.com', True, True, 'ns')
+    update = RegistryUpdate(0, 2, datetime.now(), {party, site}, set())
+
+    update_data = unpack(pack(serialize_binary(update)))
+    received = validate_and_deserialize_binary(
+            _validator('registry_api.yaml'), RegistryUpdate, update_data)
+    assert received.created == {party, site}
@@ -0,0 +1,41 @@
+from proof_of_concept.definitions.policy import Rule
+from proof_of_concept.policy.rules import (
+        InAssetCollection, MayAccess, ResultOfComputeIn, ResultOfDataIn)
+
+
+def test_rule_equality():
+    rule1 = MayAccess('site:ns:site1', 'asset:ns:asset1:ns:site1')
+    rule2 = MayAccess('site:ns:site1', 'asset:ns:asset1:ns:site1')
+    rule3 = MayAccess('site:ns:site2', 'asset:ns:asset1:ns:site1')
+    assert rule1 == rule2
+    assert hash(rule1) == hash(rule2)
+    assert rule1 != rule3
+    assert {rule1, rule2, rule3} == {rule1, rule3}
+    assert not hasattr(rule1, '__dict__')
+
+    assert rule1 != InAssetCollection(
+            'asset:ns:asset1:ns:site1', 'asset_collection:ns:coll1')
+
+    rule4 = ResultOfDataIn(
+            'asset:ns:asset1:ns:site1', 'asset:ns:compute1:ns:site1',
+            'asset_collection:ns:coll1')
+    rule5 = ResultOfComputeIn(
+            'asset:ns:asset1:ns:site1', 'asset:ns:compute1:ns:site1',
+            'asset_collection:ns:coll1')
+    assert rule4 != rule5
+
+
+class Tag(Rule):
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def signing_representation(self):
+        return self.name.encode('utf-8')
+
+
+def test_derived_rule_equality():
+    assert Tag('a') == Tag('a')
+    assert Tag('a') != Tag('b')
+    assert len({Tag('a'), Tag('a'), Tag('b')}) == 2
@@ -0,0 +1,228 @@
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import ruamel.yaml as yaml
+
+from proof_of_concept.definitions.assets import ComputeAsset, DataAsset
+from proof_of_concept.definitions.registry import (
+        PartyDescription, SiteDescription)
+from proof_of_concept.definitions.workflows import (
+        Job, JobSubmission, Plan, Workflow, WorkflowStep)
+from proof_of_concept.definitions.identifier import Identifier
+from proof_of_concept.policy.definitions import PolicyUpdate
+from proof_of_concept.policy.rules import (
+        InAssetCollection, MayAccess, ResultOfComputeIn)
+from proof_of_concept.registry.replication import RegistryUpdate
+from proof_of_concept.rest import json_codec, serialization
+from proof_of_concept.definitions.policy import Rule
+from proof_of_concept.rest.serialization import (
+        deserialize, deserialize_asset, register_rule_type, serialize,
+        serialize_binary, validate_and_deserialize,
+        validate_and_deserialize_binary)
+from proof_of_concept.rest.validation import Validator, ValidationError
+
+
+def _validator(api_file):
+    path = Path(__file__).parents[1] / 'proof_of_concept' / 'rest' / api_file
+    with open(path, 'r') as f:
+        return Validator(yaml.safe_load(f.read()))
+
+
+@pytest.fixture
+def policy_update(private_key):
+    rules = {
+            MayAccess('site:ns:site1', 'asset:ns:asset1:ns:site1'),
+            InAssetCollection(
+                'asset:ns:asset1:ns:site1', 'asset_collection:ns:coll1'),
+            ResultOfComputeIn(
+                '*', 'asset:ns:c:ns:site1', 'asset_collection:ns:coll1')}
+    for rule in rules:
+        rule.sign(private_key)
+    return PolicyUpdate(0, 3, datetime.now(), rules, set())
+
+
+def test_policy_update(policy_update):
+    validator = _validator('site_api.yaml')
+
+    received = validate_and_deserialize(
+            validator, 'PolicyUpdate', PolicyUpdate,
+            serialize(policy_update))
+    assert received.created == policy_update.created
+    assert {r.signature for r in received.created} == {
+            r.signature for r in policy_update.created}
+
+    received = validate_and_deserialize_binary(
+            validator, PolicyUpdate, serialize_binary(policy_update))
+    assert received.created == policy_update.created
+
+    # the usual form is decoded without calling the validator
+    no_validator = MagicMock()
+    no_validator.validate.side_effect = AssertionError
+    update_json = json_codec.loads(json_codec.dumps(serialize(policy_update)))
+    received = validate_and_deserialize(
+            no_validator, 'PolicyUpdate', PolicyUpdate, update_json)
+    assert received.created == policy_update.created
+    received = validate_and_deserialize_binary(
+            no_validator, PolicyUpdate, serialize_binary(policy_update))
+    assert received.created == policy_update.created
+
+    # unusual but valid, takes the slow path
+    update_json = serialize(policy_update)
+    for rule_json in update_json['created']:
+        rule_json['comment'] = 'test'
+    received = validate_and_deserialize(
+            validator, 'PolicyUpdate', PolicyUpdate, update_json)
+    assert received.created == policy_update.created
+
+    update_json = serialize(policy_update)
+    update_json['created'][0]['signature'] = 42
+    with pytest.raises(ValidationError):
+        validate_and_deserialize(
+                validator, 'PolicyUpdate', PolicyUpdate, update_json)
+
+    update_json = serialize(policy_update)
+    update_json['to_version'] = '3'
+    with pytest.raises(ValidationError):
+        validate_and_deserialize(
+                validator, 'PolicyUpdate', PolicyUpdate, update_json)
+
+
+def test_decoder_error(monkeypatch, policy_update):
+    def broken_decoder(user_input):
+        raise RuntimeError('Bug in decoder')
+
+    monkeypatch.setitem(
+            serialization._decoders, PolicyUpdate, broken_decoder)
+    with pytest.raises(RuntimeError):
+        validate_and_deserialize(
+                _validator('site_api.yaml'), 'PolicyUpdate', PolicyUpdate,
+                serialize(policy_update))
+
+
+def test_registry_update(monkeypatch, private_key):
+    validator = _validator('registry_api.yaml')
+    party = PartyDescription('party:ns:party1', private_key.public_key())
+    site = SiteDescription(
+            'site:ns:site1', 'party:ns:party1', 'party:ns:party1',
+            'http://site1.example.com', True, True, None)
+    update = RegistryUpdate(0, 2, datetime.now(), {party, site}, set())
+
+    received = validate_and_deserialize(
+            validator, 'RegistryUpdate', RegistryUpdate, serialize(update))
+    assert received.created == {party, site}
+
+    received = validate_and_deserialize_binary(
+            validator, RegistryUpdate, serialize_binary(update))
+    assert received.created == {party, site}
+
+    update_json = serialize(update)
+    for obj in update_json['created']:
+        obj['id'] = None
+    with pytest.raises(ValidationError):
+        validate_and_deserialize(
+                validator, 'RegistryUpdate', RegistryUpdate, update_json)
+
+    # only public keys and signatures may be bytes
+    update_data = serialize_binary(update)
+    for obj in update_data['created']:
+        obj['id'] = obj['id'].encode('ascii')
+    with pytest.raises(ValidationError):
+        validate_and_deserialize_binary(validator, RegistryUpdate, update_data)
+
+    update_data = serialize_binary(update)
+    for obj in update_data['created']:
+        if 'public_key' in obj:
+            obj['public_key'] = 'key'
+    with pytest.raises(ValidationError):
+        validate_and_deserialize_binary(validator, RegistryUpdate, update_data)
+
+    # valid binary input passes the validator too
+    def mismatch(*args):
+        raise serialization._Mismatch()
+
+    monkeypatch.setattr(serialization, '_decode_replica_update', mismatch)
+    received = validate_and_deserialize_binary(
+            validator, RegistryUpdate, serialize_binary(update))
+    assert received.created == {party, site}
+
+
+def test_job_submission_and_asset():
+    validator = _validator('site_api.yaml')
+    workflow = Workflow(
+            ['x'], {'y': 'step.y'}, [
+                WorkflowStep(
+                    'step', {'x1': 'x'}, ['y'], 'asset:ns:c:ns:site1')])
+    job = Job(workflow, {'x': 'asset:ns:d:ns:site1'})
+    submission = JobSubmission(job, Plan({'step': 'site:ns:site1'}))
+
+    received = validate_and_deserialize(
+            validator, 'JobSubmission', JobSubmission, serialize(submission))
+    assert received.job.inputs == job.inputs
+    assert received.plan.step_sites == submission.plan.step_sites
+
+    with pytest.raises(ValidationError):
+        validate_and_deserialize(
+                validator, 'JobSubmission', JobSubmission,
+                {'job': [], 'plan': {}})
+
+    data_asset = DataAsset('asset:ns:d:ns:site1', [1, 2.5])
+    asset_json = serialize(data_asset)
+    validator.validate('Asset', asset_json)
+    assert asset_json['metadata']['job_id'] == (
+            data_asset.metadata.job.content_hash())
+    received = deserialize_asset(asset_json, data_asset.metadata.job)
+    assert isinstance(received, DataAsset)
+    assert received.id == data_asset.id
+    assert received.data == [1, 2.5]
+    assert received.metadata.job is data_asset.metadata.job
+    assert received.metadata.item == data_asset.metadata.item
+
+    compute_asset = ComputeAsset('asset:ns:c:ns:site1', None)
+    received = deserialize_asset(
+            serialize(compute_asset), compute_asset.metadata.job)
+    assert isinstance(received, ComputeAsset)
+
+    asset_json = serialize(data_asset)
+    asset_json['data'] = ['1']
+    with pytest.raises(ValidationError):
+        validator.validate('Asset', asset_json)
+
+
+class MayCompute(Rule):
+    __slots__ = ('site', 'asset')
+
+    def __init__(self, site, asset):
+        super().__init__()
+        self.site = Identifier(site)
+        self.asset = Identifier(asset)
+
+    def signing_representation(self):
+        return f'{self.site}|{self.asset}|compute'.encode('utf-8')
+
+
+@pytest.fixture
+def may_compute(monkeypatch):
+    """Registers MayCompute for the duration of a test."""
+    for name in ('_rule_tags', '_rule_types', '_serializers'):
+        monkeypatch.setattr(
+                serialization, name, dict(getattr(serialization, name)))
+    register_rule_type(MayCompute, 'MayCompute', ('site', 'asset'))
+
+
+def test_register_rule_type(private_key, may_compute):
+    rule = MayCompute('site:ns:site1', 'asset:ns:asset1:ns:site1')
+    rule.sign(private_key)
+    rule_json = serialize(rule)
+    assert rule_json['type'] == 'MayCompute'
+    assert rule_json['site'] == 'site:ns:site1'
+
+    received = deserialize(Rule, rule_json)
+    assert isinstance(received, MayCompute)
+    assert received == rule
+    assert received.has_valid_signature(private_key.public_key())
+
+    rule_json['type'] = 'MayNotCompute'
+    with pytest.raises(RuntimeError):
+        deserialize(Rule, rule_json)
@@ -0,0 +1,171 @@
+import asyncio
+import gc
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+import ruamel.yaml as yaml
+
+from proof_of_concept.definitions.assets import ComputeAsset, DataAsset
+from proof_of_concept.definitions.registry import SiteDescription
+from proof_of_concept.definitions.workflows import Job
+from proof_of_concept.rest.client import SiteRestClient
+from proof_of_concept.rest.ddm_site import (
+        JobRecords, SiteRestApi, SiteServer)
+from proof_of_concept.rest.validation import Validator
+
+
+@pytest.fixture
+def site_validator():
+    site_api_file = (
+            Path(__file__).parents[1] / 'proof_of_concept' / 'rest' /
+            'site_api.yaml')
+    with open(site_api_file, 'r') as f:
+        return Validator(yaml.safe_load(f.read()))
+
+
+@pytest.fixture
+def asset_server():
+    assets = {
+            'asset:ns:dataset.d:ns:s': DataAsset(
+                'asset:ns:dataset.d:ns:s', list(range(100000))),
+            'asset:ns:dataset.f:ns:s': DataAsset(
+                'asset:ns:dataset.f:ns:s', 12.5),
+            'asset:ns:dataset.n:ns:s': DataAsset(
+                'asset:ns:dataset.n:ns:s', [[1, 2], [3]]),
+            'asset:ns:software.c:ns:s': ComputeAsset(
+                'asset:ns:software.c:ns:s', None)}
+
+    def retrieve(asset_id, requester):
+        return assets[asset_id]
+
+    store = MagicMock()
+    store.retrieve = retrieve
+    server = SiteServer(SiteRestApi(MagicMock(), store, MagicMock()))
+
+    yield server
+
+    server.close()
+
+
+@pytest.fixture
+def site_rest_client(asset_server, site_validator):
+    registry_client = MagicMock()
+    registry_client.get_site_by_id = MagicMock(
+            return_value=SiteDescription(
+                'site:ns:s', 'party:ns:p', 'party:ns:p',
+                asset_server.endpoint, True, True, 'ns'))
+
+    return SiteRestClient(
+            'site:ns:s2', site_validator, registry_client, chunk_size=1024)
+
+
+def test_download_asset_data(site_rest_client):
+    buf = BytesIO()
+    site_rest_client.download_asset_data(
+            'site:ns:s', 'asset:ns:dataset.d:ns:s', buf)
+    assert buf.getvalue().startswith(b'[0, 1, 2, ')
+    assert buf.getvalue().endswith(b', 99999]')
+
+
+def test_stream_asset(site_rest_client):
+    asset = site_rest_client.stream_asset(
+            'site:ns:s', 'asset:ns:dataset.d:ns:s')
+    assert isinstance(asset, DataAsset)
+    assert asset.data == list(range(100000))
+    assert asset.metadata.job.inputs['dataset'] == 'asset:ns:dataset.d:ns:s'
+
+    asset = site_rest_client.stream_asset(
+            'site:ns:s', 'asset:ns:dataset.f:ns:s')
+    assert asset.data == 12.5
+
+    asset = site_rest_client.stream_asset(
+            'site:ns:s', 'asset:ns:dataset.n:ns:s')
+    assert asset.data == [[1, 2], [3]]
+
+    asset = site_rest_client.stream_asset(
+            'site:ns:s', 'asset:ns:software.c:ns:s')
+    assert isinstance(asset, ComputeAsset)
+
+    with pytest.raises(KeyError):
+        site_rest_client.stream_asset('site:ns:s', 'asset:ns:dataset.x:ns:s')
+
+
+def test_async_stream_asset(asset_server, site_rest_client):
+    async_client = pytest.importorskip('proof_of_concept.rest.async_client')
+    client = async_client.AsyncSiteRestClient(
+            'site:ns:s2', site_rest_client._site_validator,
+            site_rest_client._registry_client)
+
+    async def run():
+        async with client:
+            return await asyncio.gather(
+                    client.stream_asset(
+                        'site:ns:s', 'asset:ns:dataset.d:ns:s'),
+                    client.stream_asset(
+                        'site:ns:s', 'asset:ns:dataset.n:ns:s'),
+                    client.retrieve_asset(
+                        'site:ns:s', 'asset:ns:software.c:ns:s'))
+
+    data, nested, compute = asyncio.run(run())
+    assert data.data == list(range(100000))
+    assert nested.data == [[1, 2], [3]]
+    assert isinstance(compute, ComputeAsset)
+    assert compute.metadata.job.inputs == {
+            'dataset': 'asset:ns:software.c:ns:s'}
+
+
+def test_job_records(asset_server, site_rest_client):
+    endpoint = asset_server.endpoint
+    r = requests.get(
+            f'{endpoint}/assets/asset:ns:dataset.d:ns:s/metadata',
+            params={'requester': 'site:ns:s2'})
+    metadata_json = r.json()
+    assert set(metadata_json) == {'job_id', 'item'}
+
+    job_url = f'{endpoint}/jobs/{metadata_json["job_id"]}'
+    r = requests.get(job_url, params={'requester': 'site:ns:s2'})
+    assert r.status_code == 200
+    assert r.json()['inputs'] == {'dataset': 'asset:ns:dataset.d:ns:s'}
+
+    r = requests.get(job_url)
+    assert r.status_code == 400
+
+    # not sent an asset referring to the job, so not available
+    r = requests.get(job_url, params={'requester': 'site:ns:s3'})
+    assert r.status_code == 404
+
+    r = requests.get(
+            f'{endpoint}/jobs/{"0" * 64}', params={'requester': 'site:ns:s2'})
+    assert r.status_code == 404
+
+    metadata = site_rest_client.retrieve_asset_metadata(
+            'site:ns:s', 'asset:ns:dataset.d:ns:s')
+    assert metadata.job.content_hash() == metadata_json['job_id']
+    again = site_rest_client.retrieve_asset_metadata(
+            'site:ns:s', 'asset:ns:dataset.d:ns:s')
+    assert again.job is metadata.job
+
+
+def test_job_records_equal_jobs():
+    records = JobRecords()
+    job1 = Job.niljob('asset:ns:dataset.d:ns:s')
+    job2 = Job.niljob('asset:ns:dataset.d:ns:s')
+    job_id = job1.content_hash()
+    assert job2.content_hash() == job_id
+
+    records.add(job1, 'site:ns:s2')
+    records.add(job2, 'site:ns:s3')
+
+    # the asset that referred to job1 went away
+    del job1
+    gc.collect()
+    assert records.get(job_id, 'site:ns:s2') is job2
+    assert records.get(job_id, 'site:ns:s3') is job2
+    assert records.get(job_id, 'site:ns:s4') is None
+
+    del job2
+    gc.collect()
+    assert records.get(job_id, 'site:ns:s3') is None
@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock
+
+from proof_of_concept.components.step_runner import JobRun
+from proof_of_concept.definitions.assets import ComputeAsset, DataAsset
+from proof_of_concept.definitions.workflows import (
+        Job, JobSubmission, Plan, Workflow, WorkflowStep)
+
+
+def test_compute_asset_retrieved_once():
+    workflow = Workflow(
+            ['x'], {'y': 'add2.y'}, [
+                WorkflowStep(
+                    name='add1', inputs={'x1': 'x', 'x2': 'x'},
+                    outputs=['y'],
+                    compute_asset_id='asset:ns:software.addition:ns:s'),
+                WorkflowStep(
+                    name='add2', inputs={'x1': 'add1.y', 'x2': 'x'},
+                    outputs=['y'],
+                    compute_asset_id='asset:ns:software.addition:ns:s')])
+    job = Job(workflow, {'x': 'asset:ns:dataset.d:ns:s'})
+    plan = Plan({'add1': 'site:ns:s', 'add2': 'site:ns:s'})
+
+    store = dict()
+
+    def retrieve_asset(site_id, asset_id):
+        if asset_id.startswith('asset:ns:software'):
+            return ComputeAsset(asset_id, None)
+        if asset_id.startswith('asset:ns:dataset'):
+            return DataAsset(asset_id, 1)
+        return store[asset_id]
+
+    target_store = MagicMock()
+    target_store.exists = lambda asset_id: asset_id in store
+    target_store.store = lambda asset: store.__setitem__(asset.id, asset)
+
+    site_rest_client = MagicMock()
+    site_rest_client.retrieve_asset = MagicMock(side_effect=retrieve_asset)
+    site_rest_client.stream_asset = MagicMock(side_effect=retrieve_asset)
+
+    run = JobRun(
+            MagicMock(), 'site:ns:s', MagicMock(), site_rest_client,
+            JobSubmission(job, plan), target_store)
+    run._is_legal = MagicMock(return_value=True)
+    run.run()
+
+    compute_requests = [
+            call for call in site_rest_client.retrieve_asset.call_args_list
+            if call[0][1].startswith('asset:ns:software')]
+    assert len(compute_requests) == 1
+
+    result_id = 'result:{}'.format(job.id_hashes()['y'])
+    assert store[result_id].data == 3
+
+
+def test_existing_results_reused():
+    workflow = Workflow(
+            ['x'], {'y': 'add.y'}, [
+                WorkflowStep(
+                    name='add', inputs={'x1': 'x', 'x2': 'x'},
+                    outputs=['y'],
+                    compute_asset_id='asset:ns:software.addition:ns:s')])
+    job = Job(workflow, {'x': 'asset:ns:dataset.d:ns:s'})
+    plan = Plan({'add': 'site:ns:s'})
+
+    target_store = MagicMock()
+    target_store.exists = MagicMock(return_value=True)
+    site_rest_client = MagicMock()
+
+    run = JobRun(
+            MagicMock(), 'site:ns:s', MagicMock(), site_rest_client,
+            JobSubmission(job, plan), target_store)
+    run._is_legal = MagicMock(return_value=True)
+    run.run()
+
+    result_id = 'result:{}'.format(job.id_hashes()['y'])
+    target_store.exists.assert_called_with(result_id)
+    site_rest_client.retrieve_asset.assert_not_called()
+    site_rest_client.stream_asset.assert_not_called()
+    target_store.store.assert_not_called()
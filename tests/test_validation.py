@@ -0,0 +1,159 @@
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+
+import jsonschema
+from openapi_schema_validator import OAS30Validator
+import pytest
+import ruamel.yaml as yaml
+
+from proof_of_concept.rest.validation import (
+        _compile, _validator_keywords, load_validator, ValidationError)
+
+
+def test_load_validator(tmp_path):
+    api_file = (
+            Path(__file__).parents[1] / 'proof_of_concept' / 'rest' /
+            'registry_api.yaml')
+    copied_file = tmp_path / 'registry_api.yaml'
+    shutil.copy(api_file, copied_file)
+
+    validator = load_validator(copied_file)
+    assert load_validator(copied_file) is validator
+
+    validator.validate('Party', {'id': 'party:ns:p', 'public_key': 'x'})
+    with pytest.raises(ValidationError) as e:
+        validator.validate('Party', {'id': 'party:ns:p'})
+    assert isinstance(e.value.__cause__, jsonschema.ValidationError)
+    assert str(e.value) == str(e.value.__cause__)
+    assert 'required' in str(e.value)
+    with pytest.raises(KeyError):
+        validator.validate('NoSuchClass', {})
+
+    stat = copied_file.stat()
+    os.utime(copied_file, (stat.st_atime, stat.st_mtime + 1.0))
+    assert load_validator(copied_file) is not validator
+
+
+def _schemas(api_file):
+    path = Path(__file__).parents[1] / 'proof_of_concept' / 'rest' / api_file
+    with open(path, 'r') as f:
+        return yaml.safe_load(f.read())
+
+
+def _policy_update():
+    return {
+            'from_version': 0,
+            'to_version': 3,
+            'valid_until': '2020-01-01T00:00:00',
+            'created': [
+                {
+                    'type': 'InAssetCollection',
+                    'signature': 'c2ln',
+                    'asset': 'asset:ns:a:ns:s',
+                    'collection': 'asset_collection:ns:c'},
+                {
+                    'type': 'InPartyCollection',
+                    'signature': 'c2ln',
+                    'party': 'party:ns:p',
+                    'collection': 'party_collection:ns:c'},
+                {
+                    'type': 'ResultOfDataIn',
+                    'signature': 'c2ln',
+                    'data_asset': 'asset:ns:a:ns:s',
+                    'compute_asset': '*',
+                    'collection': 'asset_collection:ns:c'}],
+            'deleted': [
+                {
+                    'type': 'MayAccess',
+                    'signature': 'c2ln',
+                    'site': 'site:ns:s',
+                    'asset': 'asset:ns:a:ns:s'}]}
+
+
+def _mutations(value):
+    """Yields variations of value with one thing changed."""
+    if isinstance(value, dict):
+        for key in value:
+            removed = dict(value)
+            del removed[key]
+            yield removed
+            for mutated in _mutations(value[key]):
+                changed = dict(value)
+                changed[key] = mutated
+                yield changed
+        yield dict(value, extra=1)
+    elif isinstance(value, list):
+        yield value + [None]
+        for i, item in enumerate(value):
+            yield value[:i] + value[i+1:]
+            for mutated in _mutations(item):
+                yield value[:i] + [mutated] + value[i+1:]
+    for other in (None, 1, 1.5, True, 'x', b'x', [], {}):
+        if other != value or type(other) is not type(value):
+            yield other
+
+
+@pytest.mark.parametrize('api_file, class_, valid', [
+    ('site_api.yaml', 'PolicyUpdate', _policy_update()),
+    ('registry_api.yaml', 'Party', {'id': 'party:ns:p', 'public_key': 'x'}),
+    ('registry_api.yaml', 'Site', {
+        'id': 'site:ns:s', 'owner_id': 'party:ns:o',
+        'admin_id': 'party:ns:a', 'endpoint': 'https://example.com',
+        'runner': True, 'store': False, 'namespace': None}),
+    ('site_api.yaml', 'Asset', {
+        'id': 'asset:ns:a:ns:s', 'data': [1, 2.5],
+        'metadata': {'job': {}, 'item': 'x'}}),
+    ('site_api.yaml', 'Job', {
+        'workflow': {}, 'inputs': {'x': 'asset:ns:a:ns:s'}}),
+    ])
+def test_compiled_check(api_file, class_, valid):
+    schema = _schemas(api_file)
+    schemas = schema['components']['schemas']
+    check = _compile(schemas[class_], schemas)
+    assert check is not None
+    validator = OAS30Validator(
+            schemas[class_],
+            resolver=jsonschema.RefResolver.from_schema(schema))
+
+    assert check(valid)
+    assert validator.is_valid(valid)
+
+    for user_input in _mutations(valid):
+        assert check(user_input) == validator.is_valid(user_input)
+
+
+def test_compile_unsupported():
+    assert _compile({'type': 'string', 'pattern': '^a$'}, {}) is None
+    assert _compile({'$ref': '#/components/schemas/X'}, {}) is None
+    assert _compile({'items': {'enum': [1]}}, {}) is None
+
+
+def test_validator_keywords():
+    # keywords missing from the list would be ignored by the checks
+    assert set(OAS30Validator.VALIDATORS) <= _validator_keywords
+
+
+def test_lazy_import():
+    # valid input should not need the generic validator
+    code = (
+            'import sys\n'
+            'from proof_of_concept.rest.ddm_site import SiteRestApi\n'
+            'from proof_of_concept.rest.validation import load_validator\n'
+            'from proof_of_concept.components.registry_client import '
+            'RegistryClient\n'
+            'import proof_of_concept.rest.registry\n'
+            'from pathlib import Path\n'
+            'api_file = Path(sys.argv[1])\n'
+            'load_validator(api_file).validate(\n'
+            '        "Party", {"id": "party:ns:p", "public_key": "x"})\n'
+            'assert "jsonschema" not in sys.modules\n'
+            'assert "openapi_schema_validator" not in sys.modules\n')
+    api_file = (
+            Path(__file__).parents[1] / 'proof_of_concept' / 'rest' /
+            'registry_api.yaml')
+    subprocess.run(
+            [sys.executable, '-c', code, str(api_file)], check=True,
+            cwd=Path(__file__).parents[1])